@@ -18,6 +18,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 import os
 import re
@@ -80,9 +81,10 @@ STATE_XLSX   = LOG_DIR / "state.xlsx"
 # PRIVATE KEY LOADER (PEM)
 # ============================================================
 
+@lru_cache(maxsize=1)
 def load_kalshi_private_key() -> str:
     """
-    Load the Kalshi private key from file.
+    Load the Kalshi private key from file (read + cleaned once per process).
 
     Kalshi provides a downloaded private key file in PEM format (often .key or .txt). :contentReference[oaicite:8]{index=8}
     We:
@@ -15,7 +15,7 @@ from __future__ import annotations
 import base64
 import json
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
 import requests
@@ -32,13 +32,17 @@ class KalshiAuth:
     api_key_id: str
     private_key_pem: str
     base_url: str  # demo/prod trading host (demo-api.kalshi.co / api.kalshi.com)
+    _private_key: Any = field(default=None, init=False, repr=False)
 
     def _load_private_key(self):
-        return serialization.load_pem_private_key(
-            self.private_key_pem.encode("utf-8"),
-            password=None,
-            backend=default_backend(),
-        )
+        # PEM -> key object is slow; do it once and reuse for every signed request
+        if self._private_key is None:
+            self._private_key = serialization.load_pem_private_key(
+                self.private_key_pem.encode("utf-8"),
+                password=None,
+                backend=default_backend(),
+            )
+        return self._private_key
 
     def _timestamp_ms(self) -> str:
         return str(int(time.time() * 1000))
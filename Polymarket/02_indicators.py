@@ -5,19 +5,32 @@ ATR, Bollinger Bands, RSI, SMA, EMA
 
 import numpy as np
 
+# Optional numba, shared with the other modules' kernels (njit = import_module("02_indicators").njit).
+# Without numba, njit is a pass-through and every kernel runs as plain Python.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
 def calculate_atr(prices, period=14):
     """Calculate Average True Range (volatility)"""
     if len(prices) < period:
         return 0
     
     if isinstance(prices[0], (int, float)):
-        closes = np.array(prices)
-        highs = closes
-        lows = closes
-    else:
-        highs = np.array([p['high'] for p in prices])
-        lows = np.array([p['low'] for p in prices])
-        closes = np.array([p['close'] for p in prices])
+        # Close-only series: high == low == close, so TR is just |close - prev close|.
+        # sum / period (not mean) keeps the zero TR of a first bar with no previous close.
+        closes = np.asarray(prices, dtype=np.float64)
+        atr = np.abs(np.diff(closes[-(period + 1):])).sum() / period
+        current_price = closes[-1]
+        return atr / current_price if current_price > 0 else 0
+    
+    highs = np.array([p['high'] for p in prices])
+    lows = np.array([p['low'] for p in prices])
+    closes = np.array([p['close'] for p in prices])
     
     high_low = highs - lows
     high_close = np.abs(highs[1:] - closes[:-1])
@@ -38,9 +51,11 @@ def calculate_bollinger_bands(prices, period=20, std_dev=2):
     if len(prices) < period:
         return 0, 0, 0
     
-    prices_array = np.array(prices)
-    middle_band = np.mean(prices_array[-period:])
-    std = np.std(prices_array[-period:])
+    window = np.asarray(prices, dtype=np.float64)[-period:]
+    middle_band = window.mean()
+    # Population std (ddof=0) reusing the mean above instead of np.std summing again
+    deviations = window - middle_band
+    std = np.sqrt(np.dot(deviations, deviations) / period)
     
     upper_band = middle_band + (std_dev * std)
     lower_band = middle_band - (std_dev * std)
@@ -48,27 +63,38 @@ def calculate_bollinger_bands(prices, period=20, std_dev=2):
     return upper_band, lower_band, middle_band
 
 
+@njit("float64(float64[::1], int64)", cache=True, nogil=True)
+def _rsi_kernel(prices, period):
+    """
+    Simple-average RSI over the last `period` deltas.
+    Explicit signature, so it compiles (or loads from cache) at import
+    rather than on the first live tick.
+    """
+    n = prices.size
+    gain = 0.0
+    loss = 0.0
+    for i in range(n - period, n):
+        d = prices[i] - prices[i - 1]
+        if d > 0:
+            gain += d
+        else:
+            loss -= d
+
+    avg_gain = gain / period
+    avg_loss = loss / period
+    if avg_loss == 0:
+        return 100.0
+
+    rs = avg_gain / avg_loss
+    return 100.0 - (100.0 / (1.0 + rs))
+
+
 def calculate_rsi(prices, period=14):
     """Calculate RSI"""
     if len(prices) < period + 1:
         return 50
     
-    prices_array = np.array(prices)
-    deltas = np.diff(prices_array)
-    
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
-    
-    avg_gain = np.mean(gains[-period:])
-    avg_loss = np.mean(losses[-period:])
-    
-    if avg_loss == 0:
-        return 100
-    
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    
-    return rsi
+    return _rsi_kernel(np.ascontiguousarray(prices, dtype=np.float64), period)
 
 
 def calculate_sma(prices, period):
@@ -83,7 +109,7 @@ def calculate_ema(prices, period):
     if len(prices) < period:
         return np.mean(prices) if len(prices) > 0 else 0
     
-    prices_array = np.array(prices)
+    prices_array = np.asarray(prices, dtype=np.float64)
     multiplier = 2 / (period + 1)
     ema = np.mean(prices_array[:period])
     
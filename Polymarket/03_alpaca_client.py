@@ -5,11 +5,67 @@ Real-time BTC price data from Alpaca
 
 import requests
 import os
-from datetime import datetime, timedelta
+import time
+import numpy as np
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # optional speedup; stdlib json parses the same payloads
+    import json
+    _json_loads = json.loads
 
 ALPACA_API_KEY = os.getenv('APCA_API_KEY_ID')
 ALPACA_SECRET_KEY = os.getenv('APCA_API_SECRET_KEY')
 ALPACA_BASE_URL = "https://data.alpaca.markets"
+PRICE_CACHE_SIZE = 100
+
+# timeframe -> (bar length, lookback padding) in seconds; unknown timeframes use hourly
+BAR_WINDOW_SECONDS = {
+    '1Min': (60, 5 * 60),
+    '5Min': (5 * 60, 10 * 60),
+    '15Min': (15 * 60, 30 * 60),
+}
+HOURLY_WINDOW_SECONDS = (3600, 3600)
+
+
+def _format_ns(ns):
+    """Epoch nanoseconds -> Alpaca RFC 3339 UTC string"""
+    return datetime.fromtimestamp(ns / 1e9, tz=timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+@dataclass(frozen=True)
+class Bars:
+    """Historical bars as parallel arrays, oldest first"""
+    timestamp: np.ndarray    # datetime64[ns], UTC
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    
+    @classmethod
+    def from_raw(cls, raw_bars):
+        """Column-decode Alpaca bar dicts ({'t','o','h','l','c','v'})"""
+        n = len(raw_bars)
+        
+        def column(key):
+            return np.fromiter((bar[key] for bar in raw_bars), dtype=np.float64, count=n)
+        
+        return cls(
+            timestamp=np.array([bar['t'].rstrip('Z') for bar in raw_bars], dtype='datetime64[ns]'),
+            open=column('o'),
+            high=column('h'),
+            low=column('l'),
+            close=column('c'),
+            volume=column('v')
+        )
+    
+    def __len__(self):
+        return len(self.close)
+
 
 class AlpacaClient:
     """Fetch BTC price data"""
@@ -20,20 +76,44 @@ class AlpacaClient:
             'APCA-API-KEY-ID': ALPACA_API_KEY,
             'APCA-API-SECRET-KEY': ALPACA_SECRET_KEY
         }
-        self.price_cache = []
+        
+        # One pooled keep-alive session instead of a new TCP+TLS handshake per request
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        
+        # Latest-bar ring buffer, one preallocated column per field (oldest slot at _head once full)
+        self._ts = np.empty(PRICE_CACHE_SIZE, dtype='datetime64[ns]')
+        self._open = np.empty(PRICE_CACHE_SIZE, dtype=np.float64)
+        self._high = np.empty(PRICE_CACHE_SIZE, dtype=np.float64)
+        self._low = np.empty(PRICE_CACHE_SIZE, dtype=np.float64)
+        self._close = np.empty(PRICE_CACHE_SIZE, dtype=np.float64)
+        self._volume = np.empty(PRICE_CACHE_SIZE, dtype=np.float64)
+        self._head = 0
+        self._n = 0
         self.last_update = None
         
         print("✅ [03] Alpaca client initialized")
     
+    def close(self):
+        """Release pooled connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
     def get_current_price(self):
         """Get latest BTC price"""
         endpoint = f"{self.base_url}/v1beta3/crypto/us/latest/bars"
         params = {'symbols': 'BTC/USD'}
         
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params)
+            response = self.session.get(endpoint, params=params, timeout=5)
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             if 'bars' in data and 'BTC/USD' in data['bars']:
                 bar = data['bars']['BTC/USD']
@@ -47,9 +127,15 @@ class AlpacaClient:
                     'volume': bar['v']
                 }
                 
-                self.price_cache.append(price_data)
-                if len(self.price_cache) > 100:
-                    self.price_cache.pop(0)
+                i = self._head
+                self._ts[i] = np.datetime64(bar['t'].rstrip('Z'), 'ns')
+                self._open[i] = bar['o']
+                self._high[i] = bar['h']
+                self._low[i] = bar['l']
+                self._close[i] = bar['c']
+                self._volume[i] = bar['v']
+                self._head = (i + 1) % PRICE_CACHE_SIZE
+                self._n = min(self._n + 1, PRICE_CACHE_SIZE)
                 
                 self.last_update = datetime.utcnow()
                 return price_data
@@ -59,56 +145,46 @@ class AlpacaClient:
             print(f"❌ [03] Error: {e}")
             return None
     
+    def _ordered(self, column):
+        """Oldest-first view of a ring buffer column (only the filled slots)"""
+        return np.roll(column, -self._head)[PRICE_CACHE_SIZE - self._n:]
+    
+    def closes(self):
+        """Cached closing prices, oldest first, as a float64 array"""
+        return self._ordered(self._close)
+    
     def get_historical_bars(self, timeframe='1Min', limit=60):
-        """Get historical bars"""
-        end = datetime.utcnow()
-        
-        if timeframe == '1Min':
-            start = end - timedelta(minutes=limit + 5)
-        elif timeframe == '5Min':
-            start = end - timedelta(minutes=(limit * 5) + 10)
-        elif timeframe == '15Min':
-            start = end - timedelta(minutes=(limit * 15) + 30)
-        else:
-            start = end - timedelta(hours=limit + 1)
+        """Get historical bars as a Bars of column arrays (empty on error)"""
+        step, pad = BAR_WINDOW_SECONDS.get(timeframe, HOURLY_WINDOW_SECONDS)
+        end_ns = time.time_ns()
+        start_ns = end_ns - (limit * step + pad) * 1_000_000_000
         
         endpoint = f"{self.base_url}/v1beta3/crypto/us/bars"
         params = {
             'symbols': 'BTC/USD',
             'timeframe': timeframe,
-            'start': start.isoformat() + 'Z',
-            'end': end.isoformat() + 'Z',
+            'start': _format_ns(start_ns),
+            'end': _format_ns(end_ns),
             'limit': limit
         }
         
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params)
+            response = self.session.get(endpoint, params=params, timeout=5)
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             if 'bars' not in data or 'BTC/USD' not in data['bars']:
-                return []
-            
-            bars = []
-            for bar in data['bars']['BTC/USD']:
-                bars.append({
-                    'timestamp': datetime.fromisoformat(bar['t'].replace('Z', '+00:00')),
-                    'open': bar['o'],
-                    'high': bar['h'],
-                    'low': bar['l'],
-                    'close': bar['c'],
-                    'volume': bar['v']
-                })
+                return Bars.from_raw([])
             
-            return bars
+            return Bars.from_raw(data['bars']['BTC/USD'])
         except Exception as e:
             print(f"❌ [03] Error: {e}")
-            return []
+            return Bars.from_raw([])
     
     def get_price_series(self, timeframe='1Min', limit=60):
         """Get closing prices only"""
         bars = self.get_historical_bars(timeframe=timeframe, limit=limit)
-        return [bar['close'] for bar in bars]
+        return bars.close.tolist()
 
 
 print("✅ [03] Alpaca client loaded")
@@ -17,6 +17,7 @@ import os
 import json
 import time
 import requests
+from operator import itemgetter
 from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -120,24 +121,24 @@ class PolymarketClient:
         Defensive sorting:
         - bids: highest price first
         - asks: lowest price first
+        Each level's price is parsed once and reused as the sort key
+        (books can run to hundreds of levels per side).
         """
-        def bid_key(lvl):
-            return _safe_float(lvl.get("price")) if lvl else None
+        def keyed(levels):
+            out = []
+            for lvl in levels or []:
+                px = _safe_float(lvl.get("price"))
+                if px is not None:
+                    out.append((px, lvl))
+            return out
 
-        def ask_key(lvl):
-            return _safe_float(lvl.get("price")) if lvl else None
+        bid_levels = keyed(bids)
+        ask_levels = keyed(asks)
+        bid_levels.sort(key=itemgetter(0), reverse=True)
+        ask_levels.sort(key=itemgetter(0))
 
-        bids_sorted = sorted(
-            [b for b in (bids or []) if _safe_float(b.get("price")) is not None],
-            key=lambda x: bid_key(x),
-            reverse=True,
-        )
-
-        asks_sorted = sorted(
-            [a for a in (asks or []) if _safe_float(a.get("price")) is not None],
-            key=lambda x: ask_key(x),
-            reverse=False,
-        )
+        bids_sorted = [lvl for _, lvl in bid_levels]
+        asks_sorted = [lvl for _, lvl in ask_levels]
 
         return bids_sorted, asks_sorted
 
@@ -21,12 +21,29 @@ How it works:
 Scores 0-100. Trade if score >= MIN_OVERREACTION_SCORE.
 """
 
+import functools
+import logging
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, List, Tuple
 
+import numpy as np
+
 from importlib import import_module
 indicators = import_module("02_indicators")
+njit = indicators.njit
+_calc_rsi = indicators.calculate_rsi  # bound once; avoids a module attribute lookup per detect()
+
+logger = logging.getLogger(__name__)
+
+
+@functools.cache
+def _clients():
+    """(03_alpaca_client, 04_polymarket_client) modules, imported once on first use"""
+    return import_module("03_alpaca_client"), import_module("04_polymarket_client")
 
 # =============================
 # Tunable thresholds
@@ -127,6 +144,33 @@ def _parse_ts(ts: Any) -> Optional[datetime]:
     return None
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+
+
+def _to_ns(dt: datetime) -> int:
+    """Aware datetime -> unix ns (integer math, no float rounding)"""
+    return (dt - _EPOCH) // _ONE_US * 1000
+
+
+def _from_ns(ns: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(ns) // 1000)
+
+
+def _trade_ts_ns(t: Dict[str, Any]) -> Optional[int]:
+    """
+    Trade timestamp as unix ns, or None if it can't be parsed.
+    Memoized on the trade dict ("_ts_ns") so each trade's timestamp
+    string is parsed once however many times the trade is read.
+    """
+    if "_ts_ns" in t:
+        return t["_ts_ns"]
+    ts = _parse_ts(t.get("timestamp") or t.get("ts") or t.get("time"))
+    ts_ns = None if ts is None else _to_ns(ts)
+    t["_ts_ns"] = ts_ns
+    return ts_ns
+
+
 def _get_trade_price_size_ts(t: Dict[str, Any]) -> Tuple[Optional[float], Optional[float], Optional[datetime]]:
     """
     Robustly pull price, size, timestamp from trade dict.
@@ -141,36 +185,64 @@ def _get_trade_price_size_ts(t: Dict[str, Any]) -> Tuple[Optional[float], Option
     """
     price = _to_float(t.get("price") if "price" in t else t.get("p"))
     size = _to_float(t.get("size") if "size" in t else t.get("s"))
-    ts = _parse_ts(t.get("timestamp") or t.get("ts") or t.get("time"))
-    return price, size, ts
+    ts_ns = _trade_ts_ns(t)
+    return price, size, None if ts_ns is None else _from_ns(ts_ns)
 
 
-def _window_trades(trades: List[Dict[str, Any]], start: datetime, end: datetime) -> List[Dict[str, Any]]:
-    out = []
+def _decode_trades(trades: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Single pass over the trade dicts into parallel columns:
+      (ts_ns int64, price float64, size float64, notional float64)
+    Rows without a usable timestamp are dropped; missing price/size -> nan.
+    """
+    n = len(trades)
+    ts_ns = np.empty(n, dtype=np.int64)
+    price = np.empty(n, dtype=np.float64)
+    size = np.empty(n, dtype=np.float64)
+
+    k = 0
     for t in trades:
-        _, _, ts = _get_trade_price_size_ts(t)
-        if ts is None:
+        t_ns = _trade_ts_ns(t)
+        if t_ns is None:
             continue
-        if start <= ts <= end:
-            out.append(t)
-    return out
+        p = _to_float(t.get("price") if "price" in t else t.get("p"))
+        s = _to_float(t.get("size") if "size" in t else t.get("s"))
+        ts_ns[k] = t_ns
+        price[k] = np.nan if p is None else p
+        size[k] = np.nan if s is None else s
+        k += 1
+
+    price, size = price[:k], size[:k]
+    return ts_ns[:k], price, size, price * size
 
 
-def _last_trade_before(trades: List[Dict[str, Any]], cutoff: datetime) -> Optional[Dict[str, Any]]:
+@dataclass
+class _TradeView:
     """
-    Find the most recent trade at/before cutoff.
-    Assumes trades can be in any order.
+    Trades sorted by timestamp, built once per detect() call.
+    Time windows are located by binary search on ts_ns instead of
+    rescanning (and re-parsing) the whole trade list for every window,
+    and every scoring step reads columns rather than the trade dicts.
+    Trades without a usable timestamp are left out.
     """
-    best = None
-    best_ts = None
-    for t in trades:
-        _, _, ts = _get_trade_price_size_ts(t)
-        if ts is None or ts > cutoff:
-            continue
-        if best_ts is None or ts > best_ts:
-            best = t
-            best_ts = ts
-    return best
+    ts_ns: np.ndarray     # int64 unix ns, ascending
+    price: np.ndarray     # float64, nan if missing
+    size: np.ndarray      # float64, nan if missing
+    notional: np.ndarray  # price * size, nan if either is missing
+
+    @classmethod
+    def from_trades(cls, trades: List[Dict[str, Any]]) -> "_TradeView":
+        ts_ns, price, size, notional = _decode_trades(trades)
+        order = np.argsort(ts_ns, kind="stable")
+        return cls(
+            ts_ns=ts_ns[order],
+            price=price[order],
+            size=size[order],
+            notional=notional[order],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ts_ns)
 
 
 def _orderbook_depths(orderbook: Dict[str, Any]) -> Tuple[float, float]:
@@ -186,6 +258,161 @@ def _orderbook_imbalance(bid_depth: float, ask_depth: float) -> Optional[float]:
     return bid_depth / total
 
 
+# (fade_direction, analyzed token's outcome label) -> outcome to buy.
+# Both directions currently recommend the opposite outcome of the token analyzed.
+_REC_MAP = {
+    ("FADE_UP", "up"): "Down",
+    ("FADE_UP", "yes"): "No",
+    ("FADE_UP", "down"): "Up",  # Down token went up (rare): opposite is Up
+    ("FADE_UP", "no"): "Yes",
+    ("FADE_DOWN", "up"): "Down",
+    ("FADE_DOWN", "yes"): "No",
+    ("FADE_DOWN", "down"): "Up",
+    ("FADE_DOWN", "no"): "Yes",
+}
+
+# Max points per stage after the sharp move; detect() stops early once the
+# stages left can no longer lift the score to min_score
+_MAX_BTC = 20
+_MAX_RETAIL = 15
+_MAX_VOL = 15
+_MAX_OB = 10
+_MAX_RSI = 10
+
+
+@njit(cache=True, nogil=True)
+def _aggregate_windows(ts_ns, notional, cutoff_ns, vol_recent_start_ns, vol_base_start_ns, now_ns, small_max):
+    """
+    Retail and volume window stats in one compiled pass over the sorted
+    trade view. Missing notionals (nan) are skipped.
+    Returns (lo, hi, median, mean, small_frac, recent_notional, base_notional):
+      lo, hi   retail window rows in [cutoff, now], or the latest 20 if that has < 8
+      median/mean/small_frac are nan when the retail window has no notionals
+    """
+    n = ts_ns.size
+    now_hi = np.searchsorted(ts_ns, now_ns, side="right")
+
+    # Prefix sums of notional (nan counted as 0): any window sum is cum[hi] - cum[lo]
+    cum = np.empty(n + 1, dtype=np.float64)
+    cum[0] = 0.0
+    for i in range(n):
+        x = notional[i]
+        cum[i + 1] = cum[i] + x if x == x else cum[i]
+
+    lo = np.searchsorted(ts_ns, cutoff_ns, side="left")
+    hi = now_hi
+    if hi - lo < 8:
+        lo = max(0, n - 20)
+        hi = n
+
+    buf = np.empty(hi - lo, dtype=np.float64)
+    m = 0
+    small = 0
+    for i in range(lo, hi):
+        x = notional[i]
+        if x == x:
+            buf[m] = x
+            if x <= small_max:
+                small += 1
+            m += 1
+
+    med = np.nan
+    mean = np.nan
+    small_frac = np.nan
+    if m > 0:
+        # Upper median (sorted[m // 2]) via O(n) quickselect
+        k = m // 2
+        med = np.partition(buf[:m], k)[k]
+        mean = (cum[hi] - cum[lo]) / m
+        small_frac = small / m
+
+    # Volume: recent = [recent_start, now], baseline = [base_start, recent_start]
+    recent_notional = cum[now_hi] - cum[np.searchsorted(ts_ns, vol_recent_start_ns, side="left")]
+    base_notional = (
+        cum[np.searchsorted(ts_ns, vol_recent_start_ns, side="right")]
+        - cum[np.searchsorted(ts_ns, vol_base_start_ns, side="left")]
+    )
+
+    return lo, hi, med, mean, small_frac, recent_notional, base_notional
+
+
+# Per-stage scoring, compiled so detect() can stop after any stage once
+# min_score is out of reach. A stat that could not be computed is passed as
+# nan and scores 0 (every comparison against nan is False); no fastmath,
+# which would let LLVM assume there are no nans.
+
+@njit(cache=True, nogil=True)
+def _move_points(abs_move, min_move, btc_abs, btc_max):
+    """(sharp move, BTC mismatch) points"""
+    # Sharp move score: 35 at threshold, +3 per extra 1%, capped at 50
+    sharp = min(35 + min(15, int((abs_move - min_move) / 0.01) * 3), 50)
+    btc = _MAX_BTC if btc_abs <= btc_max else 0
+    return sharp, btc
+
+
+@njit(cache=True, nogil=True)
+def _flow_points(med, mean, small_frac, median_max, mean_max, frac_min, vol_ratio, vol_mult):
+    """(retail panic, volume spike) points"""
+    # Retail if median is small OR lots of small trades
+    retail = 0
+    if (med <= median_max and mean <= mean_max) or small_frac >= frac_min:
+        retail = _MAX_RETAIL
+    vol = _MAX_VOL if vol_ratio >= vol_mult else 0
+    return retail, vol
+
+
+@njit(cache=True, nogil=True)
+def _band_points(x, low, high, points):
+    """points when x is at or outside [low, high] (orderbook imbalance, RSI)"""
+    return points if x <= low or x >= high else 0
+
+
+def _or_nan(x: Optional[float]) -> float:
+    return np.nan if x is None else float(x)
+
+
+# Warm the kernels up now so the first live tick doesn't pay for compilation
+_aggregate_windows(np.zeros(1, dtype=np.int64), np.zeros(1), 0, 0, 0, 0, 0.0)
+_move_points(0.0, 0.0, 0.0, 0.0)
+_flow_points(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+_band_points(0.0, 0.0, 0.0, 0)
+
+
+@dataclass(frozen=True, slots=True)
+class Signal:
+    """
+    A detected overreaction, as returned by OverreactionDetector.detect().
+    signals (per-stage breakdown) and diagnostics are only filled in when
+    the detector runs with debug=True; to_dict() gives the plain dict form.
+    """
+    action: str                          # always "BUY" (we buy an outcome to fade the move)
+    fade_direction: str                  # "FADE_UP" / "FADE_DOWN"
+    recommended_outcome: Optional[str]
+    score: int                           # 0..100, also reported as confidence
+    expected_edge: float
+    current_price: float
+    price_change: float
+    timestamp: datetime
+    signals: Optional[Dict[str, Any]] = None
+    diagnostics: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "signal": True,
+            "action": self.action,
+            "fade_direction": self.fade_direction,
+            "recommended_outcome": self.recommended_outcome,
+            "confidence": self.score,
+            "score": self.score,
+            "signals": self.signals or {},
+            "expected_edge": self.expected_edge,
+            "current_price": self.current_price,
+            "price_change": self.price_change,
+            "diagnostics": self.diagnostics or {},
+            "timestamp": self.timestamp,
+        }
+
+
 # =============================
 # Detector
 # =============================
@@ -193,9 +420,20 @@ def _orderbook_imbalance(bid_depth: float, ask_depth: float) -> Optional[float]:
 class OverreactionDetector:
     """
     Detect when Polymarket prices overreact to BTC moves.
-    Returns a dict signal or None.
+    Returns a Signal or None.
     """
 
+    __slots__ = (
+        "move_window_minutes",
+        "min_price_change",
+        "btc_move_max",
+        "volume_multiplier",
+        "min_score",
+        "use_rsi",
+        "debug",
+        "_pool",
+    )
+
     def __init__(
         self,
         move_window_minutes: int = MOVE_WINDOW_MINUTES,
@@ -213,14 +451,24 @@ class OverreactionDetector:
         self.min_score = int(min_score)
         self.use_rsi = bool(use_rsi)
         self.debug = bool(debug)
-
-        print("✅ [07] Overreaction detector initialized (time-based)")
-        print(f"   Move window: {self.move_window_minutes}m")
-        print(f"   Min Price Change: {self.min_price_change:.1%}")
-        print(f"   BTC max (mismatch): {self.btc_move_max:.2%}")
-        print(f"   Volume spike: {self.volume_multiplier:.2f}x")
-        print(f"   Min Score: {self.min_score}/100")
-        print(f"   RSI enabled: {self.use_rsi}")
+        # detect_batch workers, kept for the detector's lifetime (see close())
+        self._pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="detect")
+
+        logger.info(
+            "✅ [07] Overreaction detector initialized (time-based)\n"
+            "   Move window: %dm\n"
+            "   Min Price Change: %.1f%%\n"
+            "   BTC max (mismatch): %.2f%%\n"
+            "   Volume spike: %.2fx\n"
+            "   Min Score: %d/100\n"
+            "   RSI enabled: %s",
+            self.move_window_minutes,
+            self.min_price_change * 100,
+            self.btc_move_max * 100,
+            self.volume_multiplier,
+            self.min_score,
+            self.use_rsi,
+        )
 
     def detect(
         self,
@@ -230,23 +478,25 @@ class OverreactionDetector:
         orderbook: Dict[str, Any],
         btc_price_change_5min: float,
         outcome_label: Optional[str] = None,   # "Up"/"Down"/"YES"/"NO"
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Optional[Signal]:
         """
-        Returns:
-          {
-            signal: True,
-            action: "BUY",
-            fade_direction: "FADE_UP" or "FADE_DOWN",
-            recommended_outcome: <string or None>,  # if you pass outcome_label you can compute opposite
-            confidence: 0..100,
-            score: 0..100,
-            expected_edge: float,
-            diagnostics: {...},
-            timestamp: utc datetime
-          }
+        Returns a Signal (or None):
+          action: "BUY",
+          fade_direction: "FADE_UP" or "FADE_DOWN",
+          recommended_outcome: <string or None>,  # if you pass outcome_label you can compute opposite
+          score: 0..100,                          # to_dict() also reports it as confidence
+          expected_edge: float,
+          signals / diagnostics: {...} when debug, else None,
+          timestamp: utc datetime
+        Use signal.to_dict() for the plain dict form.
         """
         now = datetime.now(timezone.utc)
 
+        # Config read several times below; bind once as locals
+        min_move = self.min_price_change
+        min_score = self.min_score
+        use_rsi = self.use_rsi
+
         # Need trades with timestamps for correct operation
         if not recent_trades or len(recent_trades) < 10:
             return None
@@ -258,143 +508,75 @@ class OverreactionDetector:
                 return None
             current_price = p_last
 
+        # Sort once; every time window below is a binary search on this view
+        view = _TradeView.from_trades(recent_trades)
+
         # -------------------------
         # 1) Sharp move over window
         # -------------------------
         cutoff = now - timedelta(minutes=self.move_window_minutes)
 
-        t_ref = _last_trade_before(recent_trades, cutoff)
-        p_ref, _, ts_ref = _get_trade_price_size_ts(t_ref) if t_ref else (None, None, None)
+        # Reference = most recent trade at/before cutoff (binary search on the view);
+        # if none is that old, fall back to the oldest trade, view index 0
+        ref = max(int(np.searchsorted(view.ts_ns, _to_ns(cutoff), side="right")) - 1, 0)
 
-        # If no trade at/before cutoff, fall back: use oldest trade as reference
-        if p_ref is None:
-            p_ref, _, ts_ref = _get_trade_price_size_ts(recent_trades[0])
+        if len(view):
+            p_ref = float(view.price[ref])
+            ts_ref = _from_ns(view.ts_ns[ref])
+        else:
+            # No timestamped trades: the API lists newest first, so take the last one
+            p_ref, _, ts_ref = _get_trade_price_size_ts(recent_trades[-1])
 
-        if p_ref is None or p_ref <= 0:
+        if p_ref is None or np.isnan(p_ref) or p_ref <= 0:
             return None
 
         move = (current_price - p_ref) / p_ref
 
-        # Score components
-        score = 0
-        signals: Dict[str, Any] = {}
-
         # Make move scoring graded (helps it trip)
         abs_move = abs(move)
-        if abs_move < self.min_price_change:
+        if abs_move < min_move:
             return None  # no sharp move, no signal (keep this as the one hard gate)
 
-        # Sharp move score: 35 at threshold, up to 50 as it grows
-        sharp_score = 35 + min(15, int((abs_move - self.min_price_change) / 0.01) * 3)  # +3 per extra 1%
-        sharp_score = min(sharp_score, 50)
-        score += sharp_score
-
         fade_direction = "FADE_UP" if move > 0 else "FADE_DOWN"
         action = "BUY"  # We always BUY one outcome to fade the move
 
-        signals["sharp_move"] = {
-            "triggered": True,
-            "move_window_min": self.move_window_minutes,
-            "ref_price": p_ref,
-            "ref_ts": ts_ref.isoformat() if ts_ref else None,
-            "current_price": current_price,
-            "price_change": move,
-            "score": sharp_score,
-        }
+        rsi_max = _MAX_RSI if use_rsi else 0
 
         # -------------------------
-        # 2) BTC mismatch scoring
+        # 2) BTC mismatch
         # -------------------------
         btc_abs = abs(btc_price_change_5min) if btc_price_change_5min is not None else None
-        mismatch = (btc_abs is not None) and (btc_abs <= self.btc_move_max)
-
-        btc_score = 0
-        if mismatch:
-            btc_score = 20
-            score += btc_score
-
-        signals["btc_mismatch"] = {
-            "triggered": mismatch,
-            "btc_change_5min": btc_price_change_5min,
-            "btc_max": self.btc_move_max,
-            "score": btc_score,
-            "note": "Token moved but BTC did not (overreaction candidate)" if mismatch else "BTC also moved (less pure)",
-        }
+        sharp_score, btc_score = _move_points(abs_move, min_move, _or_nan(btc_abs), self.btc_move_max)
+        mismatch = btc_score > 0
 
-        # -------------------------
-        # 3) Retail panic (notional)
-        # -------------------------
-        # Use trades in last move window for retail stats
-        window_trades = _window_trades(recent_trades, cutoff, now)
-        if len(window_trades) < 8:
-            window_trades = recent_trades[-20:]  # fallback
-
-        notionals = []
-        small_flags = []
-        for t in window_trades:
-            p, s, _ = _get_trade_price_size_ts(t)
-            if p is None or s is None:
-                continue
-            notional = p * s
-            notionals.append(notional)
-            small_flags.append(1 if notional <= RETAIL_MEDIAN_NOTIONAL_MAX else 0)
-
-        retail_score = 0
-        retail_triggered = False
-        med_notional = None
-        mean_notional = None
-        small_frac = None
-
-        if notionals:
-            notionals_sorted = sorted(notionals)
-            n = len(notionals_sorted)
-            med_notional = notionals_sorted[n // 2]
-            mean_notional = sum(notionals_sorted) / n
-            small_frac = sum(small_flags) / len(small_flags) if small_flags else 0.0
-
-            # Retail if median is small OR lots of small trades
-            if (med_notional <= RETAIL_MEDIAN_NOTIONAL_MAX and mean_notional <= RETAIL_MEAN_NOTIONAL_MAX) or (small_frac >= RETAIL_FRACTION_MIN):
-                retail_triggered = True
-                retail_score = 15
-                score += retail_score
-
-        signals["retail_panic"] = {
-            "triggered": retail_triggered,
-            "median_notional": med_notional,
-            "mean_notional": mean_notional,
-            "small_trade_frac": small_frac,
-            "thresholds": {
-                "median_max": RETAIL_MEDIAN_NOTIONAL_MAX,
-                "mean_max": RETAIL_MEAN_NOTIONAL_MAX,
-                "small_frac_min": RETAIL_FRACTION_MIN,
-            },
-            "score": retail_score,
-        }
+        score = sharp_score + btc_score
+        if score + _MAX_RETAIL + _MAX_VOL + _MAX_OB + rsi_max < min_score:
+            return None
 
         # -------------------------
-        # 4) Volume spike (time-based)
+        # 3) Retail panic (notional) + 4) volume spike (time-based)
         # -------------------------
-        vol_recent_start = now - timedelta(minutes=VOL_RECENT_MINUTES)
-        vol_base_start = now - timedelta(minutes=VOL_BASELINE_MINUTES)
-
-        recent_slice = _window_trades(recent_trades, vol_recent_start, now)
-        base_slice = _window_trades(recent_trades, vol_base_start, vol_recent_start)
-
-        def sum_notional(trs: List[Dict[str, Any]]) -> float:
-            total = 0.0
-            for t in trs:
-                p, s, _ = _get_trade_price_size_ts(t)
-                if p is None or s is None:
-                    continue
-                total += p * s
-            return total
-
-        recent_notional = sum_notional(recent_slice)
-        base_notional = sum_notional(base_slice)
+        # Retail stats use trades in the last move window (fallback: latest 20 trades);
+        # volume compares the last VOL_RECENT_MINUTES against the baseline before it.
+        now_ns = _to_ns(now)
+        lo, hi, med, mean, frac, recent_notional, base_notional = _aggregate_windows(
+            view.ts_ns, view.notional,
+            _to_ns(cutoff),
+            now_ns - VOL_RECENT_MINUTES * 60 * 1_000_000_000,
+            now_ns - VOL_BASELINE_MINUTES * 60 * 1_000_000_000,
+            now_ns,
+            RETAIL_MEDIAN_NOTIONAL_MAX,
+        )
+        window_rows = slice(int(lo), int(hi))
+        window_count = window_rows.stop - window_rows.start
+
+        med_notional = None if np.isnan(med) else float(med)
+        mean_notional = None if np.isnan(mean) else float(mean)
+        small_frac = None if np.isnan(frac) else float(frac)
+        recent_notional = float(recent_notional)
+        base_notional = float(base_notional)
 
         vol_ratio = None
-        vol_triggered = False
-        vol_score = 0
 
         # Normalize baseline to same duration as recent
         if base_notional > 0 and VOL_BASELINE_MINUTES > 0:
@@ -402,88 +584,59 @@ class OverreactionDetector:
             expected_recent = base_per_min * float(VOL_RECENT_MINUTES)
             vol_ratio = recent_notional / expected_recent if expected_recent > 0 else None
 
-            if vol_ratio is not None and vol_ratio >= self.volume_multiplier:
-                vol_triggered = True
-                vol_score = 15
-                score += vol_score
-
-        signals["volume_spike"] = {
-            "triggered": vol_triggered,
-            "recent_minutes": VOL_RECENT_MINUTES,
-            "baseline_minutes": VOL_BASELINE_MINUTES,
-            "recent_notional": recent_notional,
-            "baseline_notional": base_notional,
-            "vol_ratio": vol_ratio,
-            "threshold": self.volume_multiplier,
-            "score": vol_score,
-        }
+        retail_score, vol_score = _flow_points(
+            med, mean, frac,
+            RETAIL_MEDIAN_NOTIONAL_MAX, RETAIL_MEAN_NOTIONAL_MAX, RETAIL_FRACTION_MIN,
+            _or_nan(vol_ratio), self.volume_multiplier,
+        )
+
+        score += retail_score + vol_score
+        if score + _MAX_OB + rsi_max < min_score:
+            return None
 
         # -------------------------
-        # 5) Orderbook exhaustion / imbalance scoring
+        # 5) Orderbook exhaustion / imbalance
         # -------------------------
+        # For fade-up (price pumped), we'd like to see bid-heavy imbalance (chasing) or thin asks
+        # For fade-down, ask-heavy imbalance or thin bids
         bid_depth, ask_depth = _orderbook_depths(orderbook)
         imb = _orderbook_imbalance(bid_depth, ask_depth)
 
-        ob_score = 0
-        ob_triggered = False
+        ob_score = _band_points(_or_nan(imb), 1.0 - IMBALANCE_EXTREME, IMBALANCE_EXTREME, _MAX_OB)
 
-        # For fade-up (price pumped), we'd like to see bid-heavy imbalance (chasing) or thin asks
-        # For fade-down, ask-heavy imbalance or thin bids
-        if imb is not None:
-            if imb >= IMBALANCE_EXTREME or imb <= (1.0 - IMBALANCE_EXTREME):
-                ob_triggered = True
-                ob_score = 10
-                score += ob_score
-
-        signals["orderbook_imbalance"] = {
-            "triggered": ob_triggered,
-            "bid_depth": bid_depth,
-            "ask_depth": ask_depth,
-            "imbalance": imb,
-            "extreme": IMBALANCE_EXTREME,
-            "score": ob_score,
-        }
+        score += ob_score
+        if score + rsi_max < min_score:
+            return None
 
         # -------------------------
-        # 6) RSI bonus (optional)
+        # 6) RSI (optional)
         # -------------------------
-        rsi_score = 0
-        rsi_triggered = False
         rsi_val = None
 
-        if self.use_rsi:
+        if use_rsi:
             # Use trade-derived prices if possible; fall back to recent_prices
-            prices_for_rsi = []
-            # sample from window trades to reduce tick noise
-            for idx, t in enumerate(window_trades):
-                if idx % RSI_SAMPLE_EVERY_N_TRADES != 0:
-                    continue
-                p, _, _ = _get_trade_price_size_ts(t)
-                if p is not None:
-                    prices_for_rsi.append(p)
-
-            if len(prices_for_rsi) < RSI_PERIOD + 2 and recent_prices:
-                prices_for_rsi = recent_prices[-max(30, RSI_PERIOD + 5):]
-
-            if len(prices_for_rsi) >= RSI_PERIOD + 1:
-                rsi_val = indicators.calculate_rsi(prices_for_rsi, period=RSI_PERIOD)
-                if rsi_val is not None:
-                    if rsi_val <= RSI_OVERSOLD or rsi_val >= RSI_OVERBOUGHT:
-                        rsi_triggered = True
-                        rsi_score = 10
-                        score += rsi_score
-
-        signals["rsi_extreme"] = {
-            "triggered": rsi_triggered,
-            "rsi": rsi_val,
-            "oversold": RSI_OVERSOLD,
-            "overbought": RSI_OVERBOUGHT,
-            "score": rsi_score,
-        }
+            # sample from window trade prices to reduce tick noise (strided view, no copy)
+            prices_for_rsi = view.price[window_rows][::RSI_SAMPLE_EVERY_N_TRADES]
+            if np.isnan(prices_for_rsi).any():
+                prices_for_rsi = prices_for_rsi[~np.isnan(prices_for_rsi)]
+
+            if prices_for_rsi.size < RSI_PERIOD + 2 and recent_prices is not None and len(recent_prices):
+                prices_for_rsi = np.asarray(recent_prices[-max(30, RSI_PERIOD + 5):], dtype=np.float64)
+
+            if prices_for_rsi.size >= RSI_PERIOD + 1:
+                rsi_val = _calc_rsi(prices_for_rsi, period=RSI_PERIOD)
+
+        rsi_score = _band_points(_or_nan(rsi_val), float(RSI_OVERSOLD), float(RSI_OVERBOUGHT), _MAX_RSI)
+
+        score += rsi_score
 
         # Cap score
         score = int(min(score, 100))
 
+        # Final decision
+        if score < min_score:
+            return None
+
         # -------------------------
         # Recommended outcome (binary-aware)
         # -------------------------
@@ -491,86 +644,155 @@ class OverreactionDetector:
         # we can suggest the opposite outcome to fade.
         recommended_outcome = None
         if outcome_label:
-            lab = (outcome_label or "").strip().lower()
-            if fade_direction == "FADE_UP":
-                # token price went up → fade by buying the opposite outcome
-                if lab in ("up", "yes"):
-                    recommended_outcome = "Down" if lab == "up" else "No"
-                elif lab in ("down", "no"):
-                    # If you're looking at Down token but it went up (rare), opposite is Up/Yes
-                    recommended_outcome = "Up" if lab == "down" else "Yes"
-            else:
-                # token price went down → fade by buying opposite
-                if lab in ("up", "yes"):
-                    recommended_outcome = "Down" if lab == "up" else "No"
-                elif lab in ("down", "no"):
-                    recommended_outcome = "Up" if lab == "down" else "Yes"
+            recommended_outcome = _REC_MAP.get((fade_direction, outcome_label.strip().lower()))
 
         # Expected edge heuristic (keep conservative)
         expected_edge = (score / 100.0) * 0.06  # 3.3% at 55, 3.6% at 60, 6% at 100
 
-        # Diagnostics you’ll want in logs
-        diagnostics = {
-            "window_trades_count": len(window_trades),
-            "recent_trades_count": len(recent_trades),
-            "cutoff": cutoff.isoformat(),
-            "now": now.isoformat(),
-        }
+        # Per-stage breakdown for print_signal / logs; skipped unless debugging
+        signals: Optional[Dict[str, Any]] = None
+        diagnostics: Optional[Dict[str, Any]] = None
+        if self.debug:
+            signals = {
+                "sharp_move": {
+                    "triggered": True,
+                    "move_window_min": self.move_window_minutes,
+                    "ref_price": p_ref,
+                    "ref_ts": ts_ref.isoformat() if ts_ref else None,
+                    "current_price": current_price,
+                    "price_change": move,
+                    "score": sharp_score,
+                },
+                "btc_mismatch": {
+                    "triggered": mismatch,
+                    "btc_change_5min": btc_price_change_5min,
+                    "btc_max": self.btc_move_max,
+                    "score": btc_score,
+                    "note": "Token moved but BTC did not (overreaction candidate)" if mismatch else "BTC also moved (less pure)",
+                },
+                "retail_panic": {
+                    "triggered": retail_score > 0,
+                    "median_notional": med_notional,
+                    "mean_notional": mean_notional,
+                    "small_trade_frac": small_frac,
+                    "thresholds": {
+                        "median_max": RETAIL_MEDIAN_NOTIONAL_MAX,
+                        "mean_max": RETAIL_MEAN_NOTIONAL_MAX,
+                        "small_frac_min": RETAIL_FRACTION_MIN,
+                    },
+                    "score": retail_score,
+                },
+                "volume_spike": {
+                    "triggered": vol_score > 0,
+                    "recent_minutes": VOL_RECENT_MINUTES,
+                    "baseline_minutes": VOL_BASELINE_MINUTES,
+                    "recent_notional": recent_notional,
+                    "baseline_notional": base_notional,
+                    "vol_ratio": vol_ratio,
+                    "threshold": self.volume_multiplier,
+                    "score": vol_score,
+                },
+                "orderbook_imbalance": {
+                    "triggered": ob_score > 0,
+                    "bid_depth": bid_depth,
+                    "ask_depth": ask_depth,
+                    "imbalance": imb,
+                    "extreme": IMBALANCE_EXTREME,
+                    "score": ob_score,
+                },
+                "rsi_extreme": {
+                    "triggered": rsi_score > 0,
+                    "rsi": rsi_val,
+                    "oversold": RSI_OVERSOLD,
+                    "overbought": RSI_OVERBOUGHT,
+                    "score": rsi_score,
+                },
+            }
 
-        # Final decision
-        if score >= self.min_score:
-            return {
-                "signal": True,
-                "action": action,
-                "fade_direction": fade_direction,
-                "recommended_outcome": recommended_outcome,
-                "confidence": score,
-                "score": score,
-                "signals": signals,
-                "expected_edge": expected_edge,
-                "current_price": current_price,
-                "price_change": move,
-                "diagnostics": diagnostics,
-                "timestamp": now,
+            # Diagnostics you’ll want in logs
+            diagnostics = {
+                "window_trades_count": window_count,
+                "recent_trades_count": len(recent_trades),
+                "cutoff": cutoff.isoformat(),
+                "now": now.isoformat(),
             }
 
-        return None
+        return Signal(
+            action=action,
+            fade_direction=fade_direction,
+            recommended_outcome=recommended_outcome,
+            score=score,
+            expected_edge=expected_edge,
+            current_price=current_price,
+            price_change=move,
+            timestamp=now,
+            signals=signals,
+            diagnostics=diagnostics,
+        )
+
+    def detect_batch(self, items: List[Dict[str, Any]]) -> List[Optional[Signal]]:
+        """
+        detect() for many tokens at once. Each item is the keyword arguments
+        for one detect() call; results come back in the same order.
+        Only the compiled kernels release the GIL, so with numba the calls
+        overlap partly; the rest of detect() still runs one thread at a time.
+        """
+        if len(items) <= 1:
+            return [self.detect(**it) for it in items]
+        return list(self._pool.map(lambda it: self.detect(**it), items))
+
+    def close(self) -> None:
+        """Release the detect_batch thread pool"""
+        self._pool.shutdown(wait=False)
+
+    def print_signal(self, signal) -> None:
+        """Log a signal breakdown at DEBUG (no-op unless debug=True); takes a Signal or its dict form"""
+        if not self.debug or not logger.isEnabledFor(logging.DEBUG):
+            return
+
+        if isinstance(signal, Signal):
+            signal = signal.to_dict()
 
-    def print_signal(self, signal: Dict[str, Any]) -> None:
         if not signal or not signal.get("signal"):
-            print("❌ No signal detected")
+            logger.debug("❌ No signal detected")
             return
 
-        print("\n🎯 OVERREACTION SIGNAL DETECTED!")
-        print(f"   Action: {signal.get('action')}")
-        print(f"   Fade: {signal.get('fade_direction')}")
+        lines = [
+            "",
+            "🎯 OVERREACTION SIGNAL DETECTED!",
+            "   Action: %s" % signal.get("action"),
+            "   Fade: %s" % signal.get("fade_direction"),
+        ]
         if signal.get("recommended_outcome"):
-            print(f"   Recommended outcome: {signal.get('recommended_outcome')}")
-        print(f"   Confidence/Score: {signal.get('score')}/100")
-        print(f"   Expected Edge: {signal.get('expected_edge'):.2%}")
-        print(f"   Current Price: ${signal.get('current_price'):.4f}")
-        print(f"   Move: {signal.get('price_change'):+.2%}")
+            lines.append("   Recommended outcome: %s" % signal.get("recommended_outcome"))
+        lines += [
+            "   Confidence/Score: %s/100" % signal.get("score"),
+            "   Expected Edge: %.2f%%" % (signal.get("expected_edge") * 100),
+            "   Current Price: $%.4f" % signal.get("current_price"),
+            "   Move: %+.2f%%" % (signal.get("price_change") * 100),
+            "",
+            "   Breakdown:",
+        ]
 
-        print("\n   Breakdown:")
         for name, data in (signal.get("signals") or {}).items():
             trig = data.get("triggered")
             emoji = "✓" if trig else "✗"
-            print(f"   {emoji} {name}: score={data.get('score', 0)}")
+            lines.append("   %s %s: score=%s" % (emoji, name, data.get("score", 0)))
             # A few key details:
             if name == "sharp_move":
-                print(f"      ref={data.get('ref_price')} at {data.get('ref_ts')}")
+                lines.append("      ref=%s at %s" % (data.get("ref_price"), data.get("ref_ts")))
             if name == "btc_mismatch":
-                print(f"      btc_5m={data.get('btc_change_5min')}")
+                lines.append("      btc_5m=%s" % data.get("btc_change_5min"))
             if name == "retail_panic":
-                print(f"      median_notional={data.get('median_notional')} small_frac={data.get('small_trade_frac')}")
+                lines.append("      median_notional=%s small_frac=%s" % (data.get("median_notional"), data.get("small_trade_frac")))
             if name == "volume_spike":
-                print(f"      vol_ratio={data.get('vol_ratio')} recent_notional={data.get('recent_notional')}")
+                lines.append("      vol_ratio=%s recent_notional=%s" % (data.get("vol_ratio"), data.get("recent_notional")))
             if name == "orderbook_imbalance":
-                print(f"      imbalance={data.get('imbalance')} bid={data.get('bid_depth')} ask={data.get('ask_depth')}")
+                lines.append("      imbalance=%s bid=%s ask=%s" % (data.get("imbalance"), data.get("bid_depth"), data.get("ask_depth")))
             if name == "rsi_extreme":
-                print(f"      rsi={data.get('rsi')}")
+                lines.append("      rsi=%s" % data.get("rsi"))
 
-        print()
+        logger.debug("\n".join(lines) + "\n")
 
 
 print("✅ [07] Overreaction detector loaded (time-based)")
@@ -580,12 +802,12 @@ print("✅ [07] Overreaction detector loaded (time-based)")
 # Test Runner
 # =============================
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     print("\n🧪 Testing [07] - Overreaction Detector (time-based)\n" + "=" * 90)
 
     # Import clients for testing
     try:
-        alpaca_client_module = import_module("03_alpaca_client")
-        poly_client_module = import_module("04_polymarket_client")
+        alpaca_client_module, poly_client_module = _clients()
         AlpacaClient = alpaca_client_module.AlpacaClient
         PolymarketClient = poly_client_module.PolymarketClient
     except ImportError as e:
@@ -599,8 +821,8 @@ if __name__ == "__main__":
     # BTC 5m change
     btc_bars = alpaca.get_historical_bars(timeframe="1Min", limit=10)
     if btc_bars and len(btc_bars) >= 6:
-        btc_current = btc_bars[-1]["close"]
-        btc_5m_ago = btc_bars[-6]["close"]
+        btc_current = btc_bars.close[-1]
+        btc_5m_ago = btc_bars.close[-6]
         btc_change_5min = (btc_current - btc_5m_ago) / btc_5m_ago if btc_5m_ago else 0.0
     else:
         btc_change_5min = 0.001
@@ -652,6 +874,37 @@ if __name__ == "__main__":
     else:
         print("⚠️ No active markets found")
 
+    # Batch check: every token of the first few markets through detect_batch,
+    # which must agree with detect() run market by market
+    items = []
+    for market in (markets or [])[:3]:
+        outcomes = poly.get_outcomes_from_market(market)
+        for i, token_id in enumerate(poly.get_token_ids_from_market(market)):
+            recent_trades = poly.get_trades_public(token_id=token_id, limit=200)
+            orderbook = poly.get_orderbook(token_id)
+            current_price = poly.get_current_price(token_id)
+            if current_price and orderbook and recent_trades:
+                items.append(dict(
+                    current_price=current_price,
+                    recent_prices=poly.get_recent_trade_prices(token_id, limit=60),
+                    recent_trades=recent_trades,
+                    orderbook=orderbook,
+                    btc_price_change_5min=btc_change_5min,
+                    outcome_label=outcomes[i] if i < len(outcomes) else None,
+                ))
+
+    if items:
+        def _key(s):
+            return None if s is None else (s.score, s.fade_direction, s.recommended_outcome)
+
+        batch = [_key(s) for s in detector.detect_batch(items)]
+        single = [_key(detector.detect(**it)) for it in items]
+        assert batch == single, (batch, single)
+        print(f"✅ detect_batch matches detect() on {len(items)} tokens ({sum(s is not None for s in batch)} signals)")
+    else:
+        print("⚠️ No market data for the batch check")
+    detector.close()
+
     print("\n" + "=" * 90)
     print("✅ Test complete")
     print("=" * 90 + "\n")
\ No newline at end of file
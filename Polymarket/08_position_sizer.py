@@ -13,7 +13,7 @@ Formula: Position = (Edge * Confidence) / Variance * Kelly_Fraction * Bankroll
 But capped by risk limits
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 
 # Position sizing limits
@@ -23,12 +23,30 @@ MAX_MARKET_DEPTH_PCT = 0.05      # Max 5% of market depth
 MIN_TRADE_SIZE = 10              # Minimum $10 per trade
 MAX_TRADE_SIZE = 200             # Maximum $200 per trade (initially)
 
+VARIANCE = 0.5                   # assumed variance of a binary outcome
+_INV_VARIANCE = 1.0 / VARIANCE
+
+# Bits in the caps_mask returned by calculate_size_fast
+CAP_BANKROLL = 1
+CAP_DEPTH = 2
+CAP_MAX_TRADE = 4
+
 
 class PositionSizer:
     """
     Calculate optimal position size using Kelly Criterion
     """
     
+    __slots__ = (
+        'bankroll',
+        'max_position_pct',
+        'kelly_fraction',
+        'max_depth_pct',
+        'min_trade_size',
+        'max_trade_size',
+        '_bankroll_recip',
+    )
+    
     def __init__(
         self,
         bankroll: float,
@@ -39,6 +57,7 @@ class PositionSizer:
         max_trade_size: float = MAX_TRADE_SIZE
     ):
         self.bankroll = bankroll
+        self._bankroll_recip = 1.0 / bankroll if bankroll > 0 else 0.0
         self.max_position_pct = max_position_pct
         self.kelly_fraction = kelly_fraction
         self.max_depth_pct = max_depth_pct
@@ -51,6 +70,57 @@ class PositionSizer:
         print(f"   Kelly Fraction: {self.kelly_fraction:.2f} (1/{int(1/self.kelly_fraction)} Kelly)")
         print(f"   Trade Range: ${self.min_trade_size:.0f} - ${self.max_trade_size:.0f}")
     
+    def _capped_size(
+        self,
+        edge: float,
+        confidence: float,
+        market_depth: float,
+        regime_score: Optional[float]
+    ) -> Tuple[float, float, int]:
+        """Kelly size, regime-adjusted size after caps, and the caps bitmask"""
+        # Kelly = (Edge * Confidence) / Variance, variance ~0.5 for binary outcomes,
+        # then fractional Kelly (1/4 Kelly for safety) of the bankroll
+        kelly_size = self.bankroll * ((edge * confidence) * _INV_VARIANCE * self.kelly_fraction)
+        
+        # If regime score is 75%, use 75% of calculated size
+        adjusted_size = kelly_size * (regime_score if regime_score is not None else 1.0)
+        
+        caps_mask = 0
+        max_bankroll_size = self.bankroll * self.max_position_pct
+        if adjusted_size > max_bankroll_size:
+            adjusted_size = max_bankroll_size
+            caps_mask |= CAP_BANKROLL
+        
+        max_depth_size = market_depth * self.max_depth_pct
+        if adjusted_size > max_depth_size:
+            adjusted_size = max_depth_size
+            caps_mask |= CAP_DEPTH
+        
+        if adjusted_size > self.max_trade_size:
+            adjusted_size = self.max_trade_size
+            caps_mask |= CAP_MAX_TRADE
+        
+        return kelly_size, adjusted_size, caps_mask
+    
+    def calculate_size_fast(
+        self,
+        edge: float,
+        confidence: float,
+        market_depth: float,
+        regime_score: Optional[float] = None
+    ) -> Tuple[float, bool, int]:
+        """
+        Same sizing as calculate_size without building the report dict.
+        
+        Returns:
+            (final_size, tradeable, caps_mask) - final_size is 0.0 when not
+            tradeable; caps_mask ORs CAP_BANKROLL / CAP_DEPTH / CAP_MAX_TRADE
+        """
+        _, adjusted_size, caps_mask = self._capped_size(edge, confidence, market_depth, regime_score)
+        if adjusted_size < self.min_trade_size:
+            return 0.0, False, caps_mask
+        return adjusted_size, True, caps_mask
+    
     def calculate_size(
         self,
         edge: float,
@@ -76,46 +146,16 @@ class PositionSizer:
                 - size_pct_bankroll: % of bankroll
                 - size_pct_depth: % of market depth
         """
-        # === STEP 1: Kelly Criterion Calculation ===
-        # Kelly = (Edge * Confidence) / Variance
-        # Assuming variance of ~0.5 for binary outcomes
-        variance = 0.5
-        
-        kelly_fraction_calc = (edge * confidence) / variance
+        # === STEPS 1-3: Kelly size, regime adjustment, hard caps ===
+        kelly_size, adjusted_size, caps_mask = self._capped_size(edge, confidence, market_depth, regime_score)
+        regime_multiplier = regime_score if regime_score is not None else 1.0
         
-        # Apply fractional Kelly (1/4 Kelly for safety)
-        fractional_kelly = kelly_fraction_calc * self.kelly_fraction
-        
-        # Kelly size in dollars
-        kelly_size = self.bankroll * fractional_kelly
-        
-        # === STEP 2: Apply Regime Adjustment ===
-        # If regime score is provided and weak, reduce size
-        regime_multiplier = 1.0
-        if regime_score is not None:
-            # If regime score is 75%, use 75% of calculated size
-            regime_multiplier = regime_score
-        
-        adjusted_size = kelly_size * regime_multiplier
-        
-        # === STEP 3: Apply Hard Caps ===
         caps_applied = []
-        
-        # Cap 1: Max % of bankroll
-        max_bankroll_size = self.bankroll * self.max_position_pct
-        if adjusted_size > max_bankroll_size:
-            adjusted_size = max_bankroll_size
+        if caps_mask & CAP_BANKROLL:
             caps_applied.append(f"Bankroll cap ({self.max_position_pct:.1%})")
-        
-        # Cap 2: Max % of market depth
-        max_depth_size = market_depth * self.max_depth_pct
-        if adjusted_size > max_depth_size:
-            adjusted_size = max_depth_size
+        if caps_mask & CAP_DEPTH:
             caps_applied.append(f"Market depth cap ({self.max_depth_pct:.1%})")
-        
-        # Cap 3: Absolute max trade size
-        if adjusted_size > self.max_trade_size:
-            adjusted_size = self.max_trade_size
+        if caps_mask & CAP_MAX_TRADE:
             caps_applied.append(f"Max trade cap (${self.max_trade_size:.0f})")
         
         # === STEP 4: Check Minimum ===
@@ -133,8 +173,9 @@ class PositionSizer:
             }
         
         # === STEP 5: Calculate Percentages ===
-        size_pct_bankroll = (adjusted_size / self.bankroll) * 100
-        size_pct_depth = (adjusted_size / market_depth * 100) if market_depth > 0 else 0
+        depth_recip = 1.0 / market_depth if market_depth > 0 else 0.0
+        size_pct_bankroll = adjusted_size * self._bankroll_recip * 100.0
+        size_pct_depth = adjusted_size * depth_recip * 100.0
         
         # === STEP 6: Build Reasoning ===
         reasoning_parts = []
@@ -172,6 +213,7 @@ class PositionSizer:
         """
         old_bankroll = self.bankroll
         self.bankroll = new_bankroll
+        self._bankroll_recip = 1.0 / new_bankroll if new_bankroll > 0 else 0.0
         change = new_bankroll - old_bankroll
         change_pct = (change / old_bankroll * 100) if old_bankroll > 0 else 0
         
@@ -315,6 +357,30 @@ if __name__ == "__main__":
     else:
         print(f"   Not tradeable: {tiny_market['reasoning']}")
     
+    print("\n" + "="*90)
+    print("Test 8: calculate_size_fast matches calculate_size")
+    print("="*90)
+    
+    cap_labels = ((CAP_BANKROLL, "Bankroll cap"), (CAP_DEPTH, "Market depth cap"), (CAP_MAX_TRADE, "Max trade cap"))
+    fast_cases = [
+        (case_sizer, edge, confidence, depth, regime)
+        for case_sizer in (sizer, big_sizer)
+        for edge, confidence in ((0.05, 0.75), (0.08, 0.90), (0.01, 0.50), (0.20, 0.95))
+        for depth in (50, 300, 5000)
+        for regime in (None, 1.0, 0.60)
+    ]
+    caps_seen = 0
+    for case_sizer, edge, confidence, depth, regime in fast_cases:
+        full = case_sizer.calculate_size(edge=edge, confidence=confidence, market_depth=depth, regime_score=regime)
+        size, tradeable, caps_mask = case_sizer.calculate_size_fast(edge, confidence, depth, regime)
+        assert (size, tradeable) == (full['final_size'], full['tradeable']), (edge, confidence, depth, regime)
+        for bit, label in cap_labels:
+            assert bool(caps_mask & bit) == any(c.startswith(label) for c in full['caps_applied']), (edge, confidence, depth, regime)
+        caps_seen |= caps_mask
+    assert caps_seen == CAP_BANKROLL | CAP_DEPTH | CAP_MAX_TRADE, caps_seen
+    
+    print(f"\n⚡ {len(fast_cases)} input sets agree (size, tradeable, every CAP_* bit)")
+    
     print("\n" + "="*90)
     print("✅ All tests complete!")
     print("="*90)
@@ -333,5 +399,6 @@ if __name__ == "__main__":
     print(f"   Test 4 (thin market):  ${test4_size:.2f} - capped by depth")
     print(f"   Test 5 (low edge):     ${test5_size:.2f} - below minimum")
     print(f"   Test 6 (after win):    ${test6_size:.2f} - bankroll grew")
+    print(f"   Test 8 (fast path):    {len(fast_cases)} cases match calculate_size")
     
     print("\n" + "="*90 + "\n")
\ No newline at end of file
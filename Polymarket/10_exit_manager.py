@@ -12,9 +12,18 @@ Exit conditions:
 Checks every position every cycle and returns exit signals
 """
 
-from typing import Dict, Any, Optional, List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import import_module
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Union
 from datetime import datetime, timezone, timedelta
 
+import numpy as np
+
+njit = import_module("02_indicators").njit
+
 # Exit thresholds
 STOP_LOSS_PCT = 0.06             # 2% stop loss
 TAKE_PROFIT_PCT = 0.04          # 5% take profit
@@ -22,6 +31,190 @@ MEAN_REVERSION_THRESHOLD = 0.04  # Within 2% of fair value (0.50)
 MAX_HOLD_TIME_SECONDS = 480      # 12 minutes max hold
 REGIME_BREAK_ATR = 0.035         # 2% ATR triggers exit
 
+FETCH_CONCURRENCY = 16           # max concurrent price requests per sweep
+
+_UTC = timezone.utc
+
+# Exit reason codes in check order (first match wins); 0 = hold
+EXIT_STOP_LOSS = 1
+EXIT_TAKE_PROFIT = 2
+EXIT_MAX_TIME = 3
+EXIT_MEAN_REVERSION = 4
+EXIT_REGIME_BREAK = 5
+EXIT_TIME_PRESSURE = 6
+
+REASON_CODES = {
+    EXIT_STOP_LOSS: 'STOP_LOSS',
+    EXIT_TAKE_PROFIT: 'TAKE_PROFIT',
+    EXIT_MAX_TIME: 'MAX_TIME',
+    EXIT_MEAN_REVERSION: 'MEAN_REVERSION',
+    EXIT_REGIME_BREAK: 'REGIME_BREAK',
+    EXIT_TIME_PRESSURE: 'TIME_PRESSURE',
+}
+
+_CODE_PRIORITY = (None, 1, 1, 1, 2, 2, 3)
+
+_REQUIRED_POSITION_KEYS = ('entry_price', 'entry_time', 'side', 'size')
+_SIDE_SIGN = {'BUY': 1.0, 'SELL': -1.0}
+_CODE_PRIORITY_ARR = np.array([p or 0 for p in _CODE_PRIORITY], dtype=np.int64)  # code 0 (no exit) -> 0
+
+
+# Exit code for each 6-bit condition mask: the lowest set bit wins (bit 0 =
+# stop loss ... bit 5 = time pressure), which is check_exit's if-ladder order
+_FIRST_SET_LUT = np.array(
+    [0] + [((m & -m).bit_length()) for m in range(1, 64)], dtype=np.int64
+)
+
+
+@njit(cache=True, nogil=True)
+def _exit_code(price, entry, inv_entry, side_sign, stop_price, tp_price, hold, regime_break, mr, maxt):
+    """
+    Numeric core of check_exit: returns (exit code, pnl_pct).
+    stop/tp are price levels from _exit_levels; side_sign is 1.0 for
+    BUY / -1.0 for SELL; regime_break is the sweep-wide BTC ATR verdict.
+    All six conditions are evaluated and packed into a mask, so there is
+    no branch per exit rule.
+    """
+    signed_price = side_sign * price
+    pnl_pct = side_sign * (price - entry) * inv_entry
+    profitable = pnl_pct > 0
+    
+    mask = (
+        int(signed_price <= side_sign * stop_price)
+        | int(signed_price >= side_sign * tp_price) << 1
+        | int(hold >= maxt) << 2
+        | int(abs(price - 0.50) <= mr and profitable) << 3
+        | int(regime_break) << 4
+        | int(maxt - hold < 120 and pnl_pct > 0.01) << 5
+    )
+    return int(_FIRST_SET_LUT[mask]), pnl_pct
+
+
+@njit(cache=True, nogil=True)
+def _exit_codes(price, entry, inv_entry, side_sign, stop_price, tp_price, hold, regime_break, mr, maxt):
+    """
+    _exit_code over arrays; rows with a nan price get code 0.
+    """
+    n = entry.size
+    codes = np.zeros(n, dtype=np.int64)
+    pnl_pct = np.zeros(n)
+    for i in range(n):
+        if np.isnan(price[i]):
+            continue
+        codes[i], pnl_pct[i] = _exit_code(
+            price[i], entry[i], inv_entry[i], side_sign[i], stop_price[i], tp_price[i], hold[i], regime_break, mr, maxt
+        )
+    return codes, pnl_pct
+
+
+# One call on dummy rows builds _exit_codes before the first sweep needs it
+_ones = np.ones(1)
+_exit_codes(_ones, _ones, _ones, _ones, _ones * 0.94, _ones * 1.04, np.zeros(1), False, 0.04, 480.0)
+del _ones
+
+
+def _exit_reason(code: int, pnl_pct: float, hold_time_seconds: float, current_price: float,
+                 btc_atr: Optional[float], time_remaining: float) -> str:
+    if code == EXIT_STOP_LOSS:
+        detail = f'down {abs(pnl_pct):.1%}'
+    elif code == EXIT_TAKE_PROFIT:
+        detail = f'up {pnl_pct:.1%}'
+    elif code == EXIT_MAX_TIME:
+        detail = f'{hold_time_seconds/60:.1f} min'
+    elif code == EXIT_MEAN_REVERSION:
+        detail = f'@ ${current_price:.4f}'
+    elif code == EXIT_REGIME_BREAK:
+        detail = f'ATR {btc_atr:.3f}'
+    else:
+        detail = f'{time_remaining/60:.1f} min left, up {pnl_pct:.1%}'
+    return f'{REASON_CODES[code]} ({detail})'
+
+
+def _exit_levels(entry, sign, sl, tp):
+    """
+    (stop price, take-profit price, 1/entry) for entry prices and side signs
+    (1.0 BUY / -1.0 SELL); scalars or arrays, thresholds may be per row.
+    A non-positive entry gets levels that never fire and a zero reciprocal,
+    so pnl_pct stays 0.
+    """
+    entry = np.asarray(entry, dtype=np.float64)
+    has_entry = entry > 0
+    stop_price = np.where(has_entry, entry * (1.0 - sign * sl), -sign * np.inf)
+    tp_price = np.where(has_entry, entry * (1.0 + sign * tp), sign * np.inf)
+    inv_entry = np.divide(1.0, entry, out=np.zeros_like(entry), where=has_entry)
+    return stop_price, tp_price, inv_entry
+
+
+@lru_cache(maxsize=2048)
+def _derived(entry: float, s: float, sl: float, tp: float) -> Tuple[float, float, float, float]:
+    """
+    _exit_levels for one position, as floats: (stop price, take-profit price,
+    side sign, 1/entry) for side sign s (1.0 BUY / -1.0 SELL)
+    """
+    stop_price, tp_price, inv_entry = _exit_levels(entry, s, sl, tp)
+    return float(stop_price), float(tp_price), s, float(inv_entry)
+
+
+# Open book layout for ExitManager.register_positions; side is +1 BUY / -1 SELL
+POSITION_DTYPE = np.dtype([
+    ('entry', np.float64),
+    ('ts', np.float64),        # entry time, unix seconds
+    ('side', np.int8),
+    ('size', np.float64),
+    ('token', object),
+])
+
+
+def position_array(positions: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Build a POSITION_DTYPE array from position dicts
+    (entry_price, entry_time, side, size, token_id)
+    """
+    arr = np.empty(len(positions), dtype=POSITION_DTYPE)
+    for i, p in enumerate(positions):
+        entry_price, entry_ts, side_sign = ExitManager._normalize(p)
+        arr[i] = (entry_price, entry_ts, side_sign, p['size'], p.get('token_id'))
+    return arr
+
+
+def _book_position(row) -> Dict[str, Any]:
+    """
+    A POSITION_DTYPE row as a position dict (entry_time as a UTC datetime)
+    """
+    return {
+        'token_id': row['token'],
+        'entry_price': float(row['entry']),
+        'entry_time': datetime.fromtimestamp(float(row['ts']), _UTC),
+        'side': 'BUY' if row['side'] > 0 else 'SELL',
+        'size': float(row['size']),
+    }
+
+
+@dataclass(slots=True)
+class ExitDecision:
+    """
+    Result of ExitManager.check_exit for one position
+    
+    Holds the raw reason_code (REASON_CODES key, 0 = hold); the readable
+    reason string is only formatted when .reason is read.
+    """
+    should_exit: bool
+    reason_code: int
+    priority: Optional[int]            # 1=urgent, 2=normal, 3=optional; None when holding
+    pnl: float
+    pnl_pct: float
+    exit_price: float = 0.0
+    hold_time_seconds: float = 0.0
+    time_remaining_seconds: float = 0.0
+    btc_atr: Optional[float] = None
+    
+    @property
+    def reason(self) -> Optional[str]:
+        if not self.reason_code:
+            return None
+        return _exit_reason(self.reason_code, self.pnl_pct, self.hold_time_seconds, self.exit_price,
+                            self.btc_atr, self.time_remaining_seconds)
+
 
 class ExitManager:
     """
@@ -41,139 +234,154 @@ class ExitManager:
         self.mean_reversion_threshold = mean_reversion_threshold
         self.max_hold_seconds = max_hold_seconds
         self.regime_break_atr = regime_break_atr
+        self.register_positions(np.empty(0, dtype=POSITION_DTYPE))
+        
+        # Long-lived price-fetch workers, shared by every sweep (see close())
+        self._pool = ThreadPoolExecutor(max_workers=FETCH_CONCURRENCY, thread_name_prefix='exit-fetch')
+        self._fetch_limit = None  # (event loop, asyncio.Semaphore) for check_all_positions_async
         
         print(f"✅ [10] Exit manager initialized")
         print(f"   Stop Loss: {self.stop_loss_pct:.1%}")
         print(f"   Take Profit: {self.take_profit_pct:.1%}")
         print(f"   Max Hold Time: {self.max_hold_seconds}s ({self.max_hold_seconds/60:.0f} min)")
     
+    def close(self) -> None:
+        """
+        Release the price-fetch thread pool
+        """
+        self._pool.shutdown(wait=False)
+    
+    @staticmethod
+    def _normalize(position: Dict[str, Any]) -> Tuple[float, float, float]:
+        """
+        Validate a position dict and return (entry_price, entry_ts, side_sign)
+        with entry_time as unix seconds and side as 1.0 (BUY) / -1.0 (SELL)
+        """
+        missing = [k for k in _REQUIRED_POSITION_KEYS if k not in position]
+        if missing:
+            raise ValueError(f"position missing required field(s): {', '.join(missing)}")
+        
+        side = position['side']
+        if side not in _SIDE_SIGN:
+            raise ValueError(f"position side must be BUY or SELL, got {side!r}")
+        
+        return float(position['entry_price']), position['entry_time'].timestamp(), _SIDE_SIGN[side]
+    
+    def prepare_position(self, position: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a position and cache its side and entry time on the dict (call once at open)
+        
+        Adds _side_sign and _entry_ts (entry_time as unix seconds; entry_time
+        must be a datetime). Stop/take-profit levels are not cached here: they
+        follow the current entry_price and this manager's thresholds.
+        Returns the same dict.
+        """
+        _, entry_ts, side_sign = self._normalize(position)
+        position['_side_sign'] = side_sign
+        position['_entry_ts'] = entry_ts
+        
+        return position
+    
     def check_exit(
         self,
         position: Dict[str, Any],
         current_price: float,
-        current_time: datetime,
+        current_time: Union[datetime, float],
         btc_atr: Optional[float] = None
-    ) -> Dict[str, Any]:
+    ) -> ExitDecision:
         """
         Check if a position should be exited
         
         Args:
             position: dict with position details
-                Required: entry_price, entry_time, side
+                Required: entry_price, entry_time, side, size
+                (uses _side_sign/_entry_ts from prepare_position when present)
             current_price: current market price
-            current_time: current datetime
+            current_time: current datetime, or unix seconds
             btc_atr: optional BTC ATR for regime check
         
         Returns:
-            dict with:
+            ExitDecision with:
                 - should_exit: bool
                 - reason: str (why to exit)
                 - priority: int (1=urgent, 2=normal, 3=optional)
                 - pnl: float (estimated PnL)
                 - pnl_pct: float (PnL percentage)
         """
-        entry_price = position.get('entry_price')
-        entry_time = position.get('entry_time')
-        side = position.get('side', 'BUY')
-        position_size = position.get('size', 0)
+        if '_side_sign' in position:
+            side_sign = position['_side_sign']
+            entry_ts = position['_entry_ts']
+        else:
+            _, entry_ts, side_sign = self._normalize(position)
         
-        # Calculate current PnL
-        if side == 'BUY':
-            pnl_pct = (current_price - entry_price) / entry_price if entry_price > 0 else 0
-        else:  # SELL
-            pnl_pct = (entry_price - current_price) / entry_price if entry_price > 0 else 0
+        return self.check_exit_fast(
+            position['entry_price'],
+            entry_ts,
+            side_sign,
+            position['size'],
+            current_price,
+            current_time.timestamp() if isinstance(current_time, datetime) else current_time,
+            btc_atr
+        )
+    
+    def check_exit_fast(
+        self,
+        entry_price: float,
+        entry_ts: float,
+        side_sign: float,
+        size: float,
+        current_price: float,
+        now_ts: float,
+        btc_atr: Optional[float] = None
+    ) -> ExitDecision:
+        """
+        check_exit on plain values: entry time and now as unix seconds,
+        side_sign 1.0 for BUY / -1.0 for SELL
+        """
+        regime_break = self._regime_break(btc_atr)
+        code, priority, pnl, pnl_pct, hold_time_seconds = self._check_exit_core(
+            entry_price, entry_ts, side_sign, size, current_price, now_ts, regime_break
+        )
         
-        pnl = pnl_pct * position_size
+        return ExitDecision(
+            should_exit=code != 0,
+            reason_code=code,
+            priority=priority,
+            pnl=pnl,
+            pnl_pct=pnl_pct,
+            exit_price=current_price,
+            hold_time_seconds=hold_time_seconds,
+            time_remaining_seconds=self.max_hold_seconds - hold_time_seconds,
+            btc_atr=btc_atr
+        )
+    
+    def _check_exit_core(
+        self,
+        entry_price: float,
+        entry_ts: float,
+        side_sign: float,
+        size: float,
+        current_price: float,
+        now_ts: float,
+        regime_break: bool
+    ) -> Tuple[int, Optional[int], float, float, float]:
+        """
+        Exit decision as a plain tuple:
+        (reason_code, priority, pnl, pnl_pct, hold_time_seconds); code 0 = hold
+        """
+        stop_price, tp_price, _, inv_entry = _derived(
+            entry_price, side_sign, self.stop_loss_pct, self.take_profit_pct
+        )
+        hold_time_seconds = now_ts - entry_ts
         
-        # Calculate hold time
-        if isinstance(entry_time, datetime):
-            hold_time_seconds = (current_time - entry_time).total_seconds()
-        else:
-            hold_time_seconds = 0
-        
-        # === EXIT CHECK 1: Stop Loss (PRIORITY 1 - URGENT) ===
-        if pnl_pct <= -self.stop_loss_pct:
-            return {
-                'should_exit': True,
-                'reason': f'STOP_LOSS (down {abs(pnl_pct):.1%})',
-                'priority': 1,
-                'pnl': pnl,
-                'pnl_pct': pnl_pct,
-                'exit_price': current_price
-            }
-        
-        # === EXIT CHECK 2: Take Profit (PRIORITY 1 - URGENT) ===
-        if pnl_pct >= self.take_profit_pct:
-            return {
-                'should_exit': True,
-                'reason': f'TAKE_PROFIT (up {pnl_pct:.1%})',
-                'priority': 1,
-                'pnl': pnl,
-                'pnl_pct': pnl_pct,
-                'exit_price': current_price
-            }
-        
-        # === EXIT CHECK 3: Max Hold Time (PRIORITY 1 - URGENT) ===
-        if hold_time_seconds >= self.max_hold_seconds:
-            return {
-                'should_exit': True,
-                'reason': f'MAX_TIME ({hold_time_seconds/60:.1f} min)',
-                'priority': 1,
-                'pnl': pnl,
-                'pnl_pct': pnl_pct,
-                'exit_price': current_price
-            }
-        
-        # === EXIT CHECK 4: Mean Reversion (PRIORITY 2 - NORMAL) ===
-        # If price has reverted to within 2% of 0.50 (fair value)
-        distance_from_fair = abs(current_price - 0.50)
-        
-        if distance_from_fair <= self.mean_reversion_threshold and pnl_pct > 0:
-            # Only exit on mean reversion if we're profitable
-            return {
-                'should_exit': True,
-                'reason': f'MEAN_REVERSION (@ ${current_price:.4f})',
-                'priority': 2,
-                'pnl': pnl,
-                'pnl_pct': pnl_pct,
-                'exit_price': current_price
-            }
-        
-        # === EXIT CHECK 5: Regime Break (PRIORITY 2 - NORMAL) ===
-        if btc_atr is not None and btc_atr > self.regime_break_atr:
-            return {
-                'should_exit': True,
-                'reason': f'REGIME_BREAK (ATR {btc_atr:.3f})',
-                'priority': 2,
-                'pnl': pnl,
-                'pnl_pct': pnl_pct,
-                'exit_price': current_price
-            }
-        
-        # === EXIT CHECK 6: Time-based urgency (PRIORITY 3 - OPTIONAL) ===
-        # If we're getting close to max time and we're profitable, consider exiting
-        time_remaining = self.max_hold_seconds - hold_time_seconds
-        
-        if time_remaining < 120 and pnl_pct > 0.01:  # Less than 2 min left, up >1%
-            return {
-                'should_exit': True,
-                'reason': f'TIME_PRESSURE ({time_remaining/60:.1f} min left, up {pnl_pct:.1%})',
-                'priority': 3,
-                'pnl': pnl,
-                'pnl_pct': pnl_pct,
-                'exit_price': current_price
-            }
-        
-        # === NO EXIT ===
-        return {
-            'should_exit': False,
-            'reason': None,
-            'priority': None,
-            'pnl': pnl,
-            'pnl_pct': pnl_pct,
-            'hold_time_seconds': hold_time_seconds,
-            'time_remaining_seconds': self.max_hold_seconds - hold_time_seconds
-        }
+        # Exit checks in order: stop loss, take profit, max time (priority 1),
+        # mean reversion (only while profitable), regime break (priority 2),
+        # time pressure - under 2 min left and up >1% (priority 3)
+        code, pnl_pct = _exit_code(
+            current_price, entry_price, inv_entry, side_sign, stop_price, tp_price, hold_time_seconds,
+            regime_break, self.mean_reversion_threshold, float(self.max_hold_seconds)
+        )
+        return code, _CODE_PRIORITY[code], pnl_pct * size, pnl_pct, hold_time_seconds
     
     def check_all_positions(
         self,
@@ -184,47 +392,226 @@ class ExitManager:
         """
         Check all positions for exits
         
+        Prices are fetched concurrently on the manager's thread pool, so a
+        sweep costs about one round-trip rather than one per position.
+        
         Args:
             positions: list of position dicts
             price_getter_fn: function(token_id) -> current_price
             btc_atr: optional BTC ATR
         
         Returns:
-            list of exit signals (only positions that should exit)
-        """
-        current_time = datetime.now(timezone.utc)
-        exit_signals = []
-        
-        for position in positions:
-            token_id = position.get('token_id')
-            
-            # Get current price
-            try:
-                current_price = price_getter_fn(token_id)
-                if current_price is None:
-                    continue
-            except Exception as e:
-                print(f"⚠️  [10] Could not get price for {token_id}: {e}")
-                continue
-            
-            # Check exit conditions
-            exit_check = self.check_exit(
-                position=position,
-                current_price=current_price,
-                current_time=current_time,
-                btc_atr=btc_atr
-            )
-            
-            if exit_check['should_exit']:
-                exit_signals.append({
-                    'position': position,
-                    'exit_check': exit_check,
-                    'token_id': token_id,
-                    'current_price': current_price
-                })
+            list of exit signals (only positions that should exit), most urgent first
+        """
+        now_ts = datetime.now(_UTC).timestamp()
+        prices = self._fetch_prices(price_getter_fn, [p.get('token_id') for p in positions])
+        return self.check_all_positions_vec(positions, prices, now_ts, btc_atr)
+    
+    async def check_all_positions_async(
+        self,
+        positions: List[Dict[str, Any]],
+        price_getter_fn,
+        btc_atr: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        check_all_positions for a coroutine price getter: async function(token_id) -> current_price
+        """
+        now_ts = datetime.now(_UTC).timestamp()
+        token_ids = [p.get('token_id') for p in positions]
+        
+        # One semaphore per event loop (asyncio primitives bind to the loop that first uses them)
+        loop = asyncio.get_running_loop()
+        if self._fetch_limit is None or self._fetch_limit[0] is not loop:
+            self._fetch_limit = (loop, asyncio.Semaphore(FETCH_CONCURRENCY))
+        limit = self._fetch_limit[1]
+        
+        async def fetch(token_id):
+            async with limit:
+                return await price_getter_fn(token_id)
         
-        # Sort by priority (most urgent first)
-        exit_signals.sort(key=lambda x: x['exit_check']['priority'])
+        results = await asyncio.gather(*(fetch(t) for t in token_ids), return_exceptions=True)
+        
+        prices = []
+        for token_id, current_price in zip(token_ids, results):
+            if isinstance(current_price, Exception):
+                print(f"⚠️  [10] Could not get price for {token_id}: {current_price}")
+                current_price = None
+            prices.append(current_price)
+        
+        return self.check_all_positions_vec(positions, prices, now_ts, btc_atr)
+    
+    def check_all_positions_vec(
+        self,
+        positions: List[Dict[str, Any]],
+        prices: Sequence[Optional[float]],
+        now_ts: float,
+        btc_atr: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Same exit rules as check_exit, evaluated for every position in one
+        compiled pass
+        
+        Args:
+            positions: list of position dicts
+            prices: current price per position (same order; None or nan = skip)
+            now_ts: current time as unix seconds
+            btc_atr: optional BTC ATR
+        
+        Returns:
+            list of exit signals in check_all_positions format, most urgent first
+        """
+        n = len(positions)
+        if n == 0:
+            return []
+        
+        for p in positions:
+            if '_side_sign' not in p:
+                self.prepare_position(p)
+        
+        def column(key):
+            return np.fromiter((p[key] for p in positions), dtype=np.float64, count=n)
+        
+        price = np.fromiter((np.nan if x is None else x for x in prices), dtype=np.float64, count=n)
+        entry = column('entry_price')
+        sign = column('_side_sign')
+        stop_price, tp_price, inv_entry = _exit_levels(entry, sign, self.stop_loss_pct, self.take_profit_pct)
+        
+        return self._scan(
+            positions, [p.get('token_id') for p in positions], price,
+            entry, inv_entry, sign, stop_price, tp_price, column('_entry_ts'), column('size'),
+            now_ts, btc_atr
+        )
+    
+    def register_positions(self, arr: np.ndarray) -> None:
+        """
+        Register the open book as a POSITION_DTYPE structured array
+        (see position_array) for check_registered
+        
+        Rows are kept sorted by entry time, oldest first.
+        """
+        self._book = arr[np.argsort(arr['ts'], kind='stable')]
+        self._book_sign = self._book['side'].astype(np.float64)
+    
+    def check_registered(
+        self,
+        price_getter_fn,
+        btc_atr: Optional[float] = None,
+        dynamic: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Check the book stored by register_positions for exits
+        
+        Args:
+            price_getter_fn: function(token_id) -> current_price
+            btc_atr: optional BTC ATR
+            dynamic: shrink SL/TP linearly to 0 over the max hold
+        
+        Returns:
+            list of exit signals (position rebuilt as a dict from the book row),
+            most urgent first, with the same precedence as check_exit
+        """
+        book = self._book
+        if len(book) == 0:
+            return []
+        
+        now_ts = datetime.now(_UTC).timestamp()
+        sign = self._book_sign
+        if dynamic:
+            stop_price, tp_price, inv_entry = self._decayed_levels(book, sign, now_ts)
+        else:
+            stop_price, tp_price, inv_entry = _exit_levels(book['entry'], sign, self.stop_loss_pct, self.take_profit_pct)
+        
+        tokens = book['token']
+        exit_signals = self._scan(
+            book, tokens, self._fetch_prices(price_getter_fn, tokens),
+            book['entry'], inv_entry, sign,
+            stop_price, tp_price, book['ts'], book['size'].astype(np.float64),
+            now_ts, btc_atr
+        )
+        for exit_signal in exit_signals:
+            exit_signal['position'] = _book_position(exit_signal['position'])
+        return exit_signals
+    
+    def _decayed_levels(self, rows: np.ndarray, sign: np.ndarray, now_ts: float):
+        """
+        _exit_levels with both thresholds scaled by the fraction of max hold
+        still remaining (full at entry, 0 at expiry)
+        """
+        decay = np.maximum(0.0, (self.max_hold_seconds - (now_ts - rows['ts'])) / self.max_hold_seconds)
+        return _exit_levels(rows['entry'], sign, self.stop_loss_pct * decay, self.take_profit_pct * decay)
+    
+    def _regime_break(self, btc_atr: Optional[float]) -> bool:
+        """
+        BTC volatility regime check; the same for every position in a sweep
+        """
+        return btc_atr is not None and btc_atr > self.regime_break_atr
+    
+    def _fetch_price(self, price_getter_fn, token_id) -> float:
+        """
+        price_getter_fn(token_id) as a float; nan when unavailable
+        """
+        try:
+            current_price = price_getter_fn(token_id)
+        except Exception as e:
+            print(f"⚠️  [10] Could not get price for {token_id}: {e}")
+            return np.nan
+        if current_price is None:
+            print(f"⚠️  [10] No price for {token_id}")
+            return np.nan
+        return float(current_price)
+    
+    def _fetch_prices(self, price_getter_fn, token_ids) -> np.ndarray:
+        """
+        Fetch the price for every token concurrently; nan where unavailable
+        """
+        n = len(token_ids)
+        if n <= 1:
+            return np.fromiter((self._fetch_price(price_getter_fn, t) for t in token_ids), dtype=np.float64, count=n)
+        return np.fromiter(
+            self._pool.map(lambda t: self._fetch_price(price_getter_fn, t), token_ids), dtype=np.float64, count=n
+        )
+    
+    def _scan(self, rows, tokens, price, entry, inv_entry, sign, stop_price, tp_price, entry_ts, size, now_ts, btc_atr):
+        """
+        Run the exit kernel over position columns and build the exit signals
+        for rows that should exit (nan price = skipped), most urgent first
+        """
+        hold = now_ts - entry_ts
+        time_remaining = self.max_hold_seconds - hold
+        
+        code, pnl_pct = _exit_codes(
+            price, entry, inv_entry, sign, stop_price, tp_price, hold,
+            self._regime_break(btc_atr), self.mean_reversion_threshold, float(self.max_hold_seconds)
+        )
+        pnl = pnl_pct * size
+        priority = _CODE_PRIORITY_ARR[code]
+        
+        exits = np.flatnonzero(code)
+        exit_signals = [None] * len(exits)
+        
+        # Priorities are only 1..3, so fill the list bucket by bucket (stable
+        # within a bucket) instead of sorting
+        k = 0
+        for bucket in (1, 2, 3):
+            for i in exits[priority[exits] == bucket]:
+                current_price = float(price[i])
+                exit_signals[k] = {
+                    'position': rows[i],
+                    'exit_check': ExitDecision(
+                        should_exit=True,
+                        reason_code=int(code[i]),
+                        priority=bucket,
+                        pnl=float(pnl[i]),
+                        pnl_pct=float(pnl_pct[i]),
+                        exit_price=current_price,
+                        hold_time_seconds=float(hold[i]),
+                        time_remaining_seconds=float(time_remaining[i]),
+                        btc_atr=btc_atr
+                    ),
+                    'token_id': tokens[i],
+                    'current_price': current_price
+                }
+                k += 1
         
         return exit_signals
     
@@ -235,28 +622,35 @@ class ExitManager:
         position = exit_signal['position']
         check = exit_signal['exit_check']
         
-        emoji = "🚨" if check['priority'] == 1 else "⚠️" if check['priority'] == 2 else "💡"
+        emoji = "🚨" if check.priority == 1 else "⚠️" if check.priority == 2 else "💡"
         
-        print(f"\n{emoji} EXIT SIGNAL (Priority {check['priority']})")
-        print(f"   Token: {position.get('token_id', 'N/A')[:20]}...")
-        print(f"   Reason: {check['reason']}")
+        print(f"\n{emoji} EXIT SIGNAL (Priority {check.priority})")
+        print(f"   Token: {str(exit_signal.get('token_id') or 'N/A')[:20]}...")
+        print(f"   Reason: {check.reason}")
         print(f"   Entry: ${position.get('entry_price', 0):.4f}")
         print(f"   Current: ${exit_signal['current_price']:.4f}")
-        print(f"   PnL: ${check['pnl']:+.2f} ({check['pnl_pct']:+.2%})")
+        print(f"   PnL: ${check.pnl:+.2f} ({check.pnl_pct:+.2%})")
         print()
     
-    def get_position_status(self, position: Dict[str, Any], current_price: float) -> str:
+    def get_position_status(
+        self,
+        position: Dict[str, Any],
+        current_price: float,
+        now: Optional[datetime] = None
+    ) -> str:
         """
         Get a quick status string for a position
+        
+        Pass `now` when printing several positions so they share one clock read.
         """
-        current_time = datetime.now(timezone.utc)
-        check = self.check_exit(position, current_price, current_time)
+        now = now or datetime.now(_UTC)
+        check = self.check_exit(position, current_price, now)
         
-        if check['should_exit']:
-            return f"⚠️ EXIT: {check['reason']} | PnL: ${check['pnl']:+.2f}"
+        if check.should_exit:
+            return f"⚠️ EXIT: {check.reason} | PnL: ${check.pnl:+.2f}"
         else:
-            time_left = check.get('time_remaining_seconds', 0)
-            return f"✅ HOLDING | PnL: ${check['pnl']:+.2f} | Time: {time_left/60:.1f}min"
+            time_left = check.time_remaining_seconds
+            return f"✅ HOLDING | PnL: ${check.pnl:+.2f} | Time: {time_left/60:.1f}min"
 
 
 print("✅ [10] Exit manager loaded")
@@ -292,9 +686,9 @@ if __name__ == "__main__":
     )
     
     print(f"Entry: $0.50 → Current: $0.48")
-    print(f"Should exit: {exit_check1['should_exit']}")
-    print(f"Reason: {exit_check1['reason']}")
-    print(f"PnL: ${exit_check1['pnl']:+.2f} ({exit_check1['pnl_pct']:+.2%})")
+    print(f"Should exit: {exit_check1.should_exit}")
+    print(f"Reason: {exit_check1.reason}")
+    print(f"PnL: ${exit_check1.pnl:+.2f} ({exit_check1.pnl_pct:+.2%})")
     
     print("\n" + "="*90)
     print("Test 2: Take profit triggered")
@@ -316,9 +710,9 @@ if __name__ == "__main__":
     )
     
     print(f"Entry: $0.50 → Current: $0.53")
-    print(f"Should exit: {exit_check2['should_exit']}")
-    print(f"Reason: {exit_check2['reason']}")
-    print(f"PnL: ${exit_check2['pnl']:+.2f} ({exit_check2['pnl_pct']:+.2%})")
+    print(f"Should exit: {exit_check2.should_exit}")
+    print(f"Reason: {exit_check2.reason}")
+    print(f"PnL: ${exit_check2.pnl:+.2f} ({exit_check2.pnl_pct:+.2%})")
     
     print("\n" + "="*90)
     print("Test 3: Max time exceeded")
@@ -339,8 +733,8 @@ if __name__ == "__main__":
     )
     
     print(f"Hold time: 13 minutes (max: 12 minutes)")
-    print(f"Should exit: {exit_check3['should_exit']}")
-    print(f"Reason: {exit_check3['reason']}")
+    print(f"Should exit: {exit_check3.should_exit}")
+    print(f"Reason: {exit_check3.reason}")
     
     print("\n" + "="*90)
     print("Test 4: Mean reversion")
@@ -362,9 +756,9 @@ if __name__ == "__main__":
     )
     
     print(f"Entry: $0.45 → Current: $0.50 (reverted to fair value)")
-    print(f"Should exit: {exit_check4['should_exit']}")
-    print(f"Reason: {exit_check4['reason']}")
-    print(f"PnL: ${exit_check4['pnl']:+.2f} ({exit_check4['pnl_pct']:+.2%})")
+    print(f"Should exit: {exit_check4.should_exit}")
+    print(f"Reason: {exit_check4.reason}")
+    print(f"PnL: ${exit_check4.pnl:+.2f} ({exit_check4.pnl_pct:+.2%})")
     
     print("\n" + "="*90)
     print("Test 5: Regime break (high volatility)")
@@ -387,8 +781,8 @@ if __name__ == "__main__":
     )
     
     print(f"BTC ATR: 2.5% (threshold: 2.0%)")
-    print(f"Should exit: {exit_check5['should_exit']}")
-    print(f"Reason: {exit_check5['reason']}")
+    print(f"Should exit: {exit_check5.should_exit}")
+    print(f"Reason: {exit_check5.reason}")
     
     print("\n" + "="*90)
     print("Test 6: No exit (position healthy)")
@@ -409,9 +803,9 @@ if __name__ == "__main__":
     )
     
     print(f"Entry: $0.50 → Current: $0.52 (up 4%)")
-    print(f"Should exit: {exit_check6['should_exit']}")
-    print(f"PnL: ${exit_check6['pnl']:+.2f} ({exit_check6['pnl_pct']:+.2%})")
-    print(f"Time remaining: {exit_check6['time_remaining_seconds']/60:.1f} minutes")
+    print(f"Should exit: {exit_check6.should_exit}")
+    print(f"PnL: ${exit_check6.pnl:+.2f} ({exit_check6.pnl_pct:+.2%})")
+    print(f"Time remaining: {exit_check6.time_remaining_seconds/60:.1f} minutes")
     
     print("\n" + "="*90)
     print("Test 7: Check multiple positions at once")
@@ -442,17 +836,89 @@ if __name__ == "__main__":
     for signal in exit_signals:
         exit_mgr.print_exit_signal(signal)
     
+    print("="*90)
+    print("Test 8: Check a registered position book")
+    print("="*90)
+    
+    # Plus a position past max hold, and one past max hold that is also below its stop
+    expired_loser = dict(old_position, token_id='token_old_loss', entry_price=0.60)
+    book_positions = positions + [old_position, expired_loser]
+    exit_mgr.register_positions(position_array(book_positions))
+    book_signals = exit_mgr.check_registered(price_getter_fn=mock_price_getter)
+    
+    print(f"\nFound {len(book_signals)} positions to exit:\n")
+    
+    for signal in book_signals:
+        exit_mgr.print_exit_signal(signal)
+    
+    # Same reasons as the dict-based sweep (stop loss outranks max time)
+    dict_reasons = {
+        s['token_id']: s['exit_check'].reason
+        for s in exit_mgr.check_all_positions(positions=book_positions, price_getter_fn=mock_price_getter)
+    }
+    book_reasons = {s['token_id']: s['exit_check'].reason for s in book_signals}
+    assert book_reasons == dict_reasons, (book_reasons, dict_reasons)
+    print(f"Reasons match check_all_positions: {book_reasons['token_old_loss']}")
+    
+    print("="*90)
+    print("Test 9: Dynamic SL/TP on the registered book")
+    print("="*90)
+    
+    # Halfway through max hold the decayed stop is 3%, so a 4% loss exits
+    # under dynamic=True but holds under the static 6% stop
+    halfway_position = {
+        'token_id': 'token_halfway',
+        'entry_price': 0.50,
+        'entry_time': current_time - timedelta(seconds=exit_mgr.max_hold_seconds / 2),
+        'side': 'BUY',
+        'size': 100
+    }
+    exit_mgr.register_positions(position_array([halfway_position]))
+    static_signals = exit_mgr.check_registered(price_getter_fn=lambda token_id: 0.48)
+    dynamic_signals = exit_mgr.check_registered(price_getter_fn=lambda token_id: 0.48, dynamic=True)
+    assert not static_signals and len(dynamic_signals) == 1, (static_signals, dynamic_signals)
+    
+    print(f"Entry: $0.50 → Current: $0.48 after {exit_mgr.max_hold_seconds / 120:.0f} minutes")
+    print(f"Static:  HOLD")
+    print(f"Dynamic: {dynamic_signals[0]['exit_check'].reason}")
+    
+    print("="*90)
+    print("Test 10: Async sweep matches check_all_positions")
+    print("="*90)
+    
+    async def mock_price_getter_async(token_id):
+        await asyncio.sleep(0)
+        return mock_price_getter(token_id)
+    
+    def signal_keys(signals):
+        return [(s['token_id'], s['exit_check'].reason, s['exit_check'].priority) for s in signals]
+    
+    # A mean-reversion exit (priority 2) listed first, so the sweep has to reorder
+    sweep_positions = [dict(healthy_position, token_id='token_revert_small', entry_price=0.49)] + book_positions
+    sync_signals = exit_mgr.check_all_positions(positions=sweep_positions, price_getter_fn=mock_price_getter)
+    async_signals = asyncio.run(exit_mgr.check_all_positions_async(
+        positions=sweep_positions,
+        price_getter_fn=mock_price_getter_async
+    ))
+    assert signal_keys(async_signals) == signal_keys(sync_signals), (signal_keys(async_signals), signal_keys(sync_signals))
+    
+    for token_id, reason, priority in signal_keys(async_signals):
+        print(f"   P{priority} {token_id}: {reason}")
+    
     print("="*90)
     print("✅ All tests complete!")
     print("="*90)
     
     print("\nSummary:")
-    print(f"   Test 1 (stop loss):      {'✅ EXIT' if exit_check1['should_exit'] else '❌ HOLD'} - {exit_check1['reason']}")
-    print(f"   Test 2 (take profit):    {'✅ EXIT' if exit_check2['should_exit'] else '❌ HOLD'} - {exit_check2['reason']}")
-    print(f"   Test 3 (max time):       {'✅ EXIT' if exit_check3['should_exit'] else '❌ HOLD'} - {exit_check3['reason']}")
-    print(f"   Test 4 (mean reversion): {'✅ EXIT' if exit_check4['should_exit'] else '❌ HOLD'} - {exit_check4['reason']}")
-    print(f"   Test 5 (regime break):   {'✅ EXIT' if exit_check5['should_exit'] else '❌ HOLD'} - {exit_check5['reason']}")
-    print(f"   Test 6 (healthy):        {'❌ HOLD' if not exit_check6['should_exit'] else '⚠️ EXIT'} - Normal")
+    print(f"   Test 1 (stop loss):      {'✅ EXIT' if exit_check1.should_exit else '❌ HOLD'} - {exit_check1.reason}")
+    print(f"   Test 2 (take profit):    {'✅ EXIT' if exit_check2.should_exit else '❌ HOLD'} - {exit_check2.reason}")
+    print(f"   Test 3 (max time):       {'✅ EXIT' if exit_check3.should_exit else '❌ HOLD'} - {exit_check3.reason}")
+    print(f"   Test 4 (mean reversion): {'✅ EXIT' if exit_check4.should_exit else '❌ HOLD'} - {exit_check4.reason}")
+    print(f"   Test 5 (regime break):   {'✅ EXIT' if exit_check5.should_exit else '❌ HOLD'} - {exit_check5.reason}")
+    print(f"   Test 6 (healthy):        {'❌ HOLD' if not exit_check6.should_exit else '⚠️ EXIT'} - Normal")
     print(f"   Test 7 (batch check):    Found {len(exit_signals)}/3 positions to exit")
+    print(f"   Test 8 (registered):     Found {len(book_signals)}/5 positions to exit")
+    print(f"   Test 9 (dynamic SL/TP):  ✅ EXIT - {dynamic_signals[0]['exit_check'].reason} (static: HOLD)")
+    print(f"   Test 10 (async sweep):   Found {len(async_signals)}/{len(sweep_positions)} positions to exit, same order as sync")
     
     print("\n" + "="*90 + "\n")
\ No newline at end of file
@@ -24,6 +24,7 @@ NOTE:
 - This script does NOT place real orders unless you implement L2 auth in PolymarketClient.
 """
 
+import logging
 import sys
 import time
 from datetime import datetime, timezone
@@ -521,6 +522,7 @@ class PolymarketTradingBot:
             return None
 
         # Normalize signal to always include keys that 11_main uses downstream
+        sig = sig.to_dict()
         sig["market"] = market
         sig["token_id"] = token_id
         sig["outcome"] = outcome
@@ -636,6 +638,7 @@ class PolymarketTradingBot:
             "size": final_size,
             "signal": signal,
         }
+        self.exit_mgr.prepare_position(position)
         self.open_positions.append(position)
         self.risk_mgr.open_position(position)
 
@@ -668,37 +671,24 @@ class PolymarketTradingBot:
         except Exception:
             btc_atr = None
 
-        positions_to_close = []
-
-        for position in list(self.open_positions):
-            token_id = position["token_id"]
-            current_price = self.poly.get_current_price(token_id)
-            if current_price is None:
-                print(f"   ⚠️  Could not get price for {str(token_id)[:20]}...")
-                continue
-
-            exit_check = self.exit_mgr.check_exit(
-                position=position,
-                current_price=float(current_price),
-                current_time=datetime.now(timezone.utc),
-                btc_atr=btc_atr
-            )
-
-            if exit_check.get("should_exit", False):
-                positions_to_close.append((position, exit_check, float(current_price)))
+        exit_signals = self.exit_mgr.check_all_positions(
+            positions=list(self.open_positions),
+            price_getter_fn=self.poly.get_current_price,
+            btc_atr=btc_atr
+        )
 
-        for position, exit_check, exit_price in positions_to_close:
-            self._close_position(position, exit_check, exit_price)
+        for exit_signal in exit_signals:
+            self._close_position(exit_signal["position"], exit_signal["exit_check"], exit_signal["current_price"])
 
-    def _close_position(self, position: Dict[str, Any], exit_check: Dict[str, Any], exit_price: float):
+    def _close_position(self, position: Dict[str, Any], exit_check: Any, exit_price: float):
         print("\n   🚪 CLOSING POSITION:")
-        print(f"      Reason: {exit_check.get('reason')}")
+        print(f"      Reason: {exit_check.reason}")
         print(f"      Entry: ${position.get('entry_price', 0):.4f} → Exit: ${exit_price:.4f}")
-        print(f"      PnL: ${exit_check.get('pnl', 0):+.2f} ({exit_check.get('pnl_pct', 0):+.2%})")
+        print(f"      PnL: ${exit_check.pnl:+.2f} ({exit_check.pnl_pct:+.2%})")
 
         self.open_positions = [p for p in self.open_positions if p["token_id"] != position["token_id"]]
 
-        self.risk_mgr.close_position(position["token_id"], exit_check.get("pnl", 0.0))
+        self.risk_mgr.close_position(position["token_id"], exit_check.pnl)
         self.sizer.update_bankroll(self.risk_mgr.current_bankroll)
 
         self.logger.log_trade({
@@ -712,10 +702,10 @@ class PolymarketTradingBot:
             "entry_price": position.get("entry_price"),
             "exit_price": exit_price,
             "position_size": position.get("size"),
-            "exit_reason": exit_check.get("reason"),
+            "exit_reason": exit_check.reason,
             "regime_score": position.get("signal", {}).get("regime", {}).get("regime_score"),
             "overreaction_score": position.get("signal", {}).get("score"),
-            "notes": f"Priority {exit_check.get('priority')}",
+            "notes": f"Priority {exit_check.priority}",
         })
 
         self.logger.update_daily_performance()
@@ -744,6 +734,8 @@ class PolymarketTradingBot:
         print("=" * 90)
 
         self.risk_mgr.print_status()
+        self.exit_mgr.close()
+        self.detector.close()
 
         if self.open_positions:
             print(f"⚠️  {len(self.open_positions)} positions still open")
@@ -758,6 +750,7 @@ class PolymarketTradingBot:
 # Main Entry Point
 # =============================
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("\n" + "=" * 90)
     print("🚀 POLYMARKET 15-MINUTE TRADING BOT")
     print("=" * 90)
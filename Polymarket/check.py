@@ -1,6 +1,7 @@
 """
 Quick script to check current market spreads
 """
+from concurrent.futures import ThreadPoolExecutor
 from importlib import import_module
 
 poly = import_module('04_polymarket_client').PolymarketClient()
@@ -22,51 +23,58 @@ if not markets:
 print(f'Found {len(markets)} markets\n')
 print('='*70)
 
-valid_markets = 0
-
-for m in markets:
-    print(f"\nMarket: {m.get('slug')}")
-    
+# Collect every (market, outcome, token) first, then fetch all books at once
+rows = []
+for m_idx, m in enumerate(markets):
     tokens = poly.get_token_ids_from_market(m)
     outcomes = poly.get_outcomes_from_market(m)
-    
     for i, token_id in enumerate(tokens):
         outcome = outcomes[i] if i < len(outcomes) else f"Outcome {i}"
+        rows.append((m_idx, outcome, token_id))
+
+with ThreadPoolExecutor(max_workers=16) as ex:
+    books = list(ex.map(poly.get_orderbook, [token_id for _, _, token_id in rows]))
+
+valid_markets = 0
+last_market = None
+
+for (m_idx, outcome, token_id), book in zip(rows, books):
+    if m_idx != last_market:
+        print(f"\nMarket: {markets[m_idx].get('slug')}")
+        last_market = m_idx
+    
+    if book:
+        # Handle missing bid/ask data
+        best_bid = book.get('best_bid')
+        best_ask = book.get('best_ask')
+        spread = book.get('spread', 0)
+        bid_depth = book.get('bid_depth', 0)
+        ask_depth = book.get('ask_depth', 0)
         
-        book = poly.get_orderbook(token_id)
-        
-        if book:
-            # Handle missing bid/ask data
-            best_bid = book.get('best_bid')
-            best_ask = book.get('best_ask')
-            spread = book.get('spread', 0)
-            bid_depth = book.get('bid_depth', 0)
-            ask_depth = book.get('ask_depth', 0)
-            
-            if best_bid is None or best_ask is None:
-                print(f"  {outcome}:")
-                print(f"    ⚠️  No liquidity (empty orderbook)")
-                continue
-            
-            spread_pct = spread * 100
-            
+        if best_bid is None or best_ask is None:
             print(f"  {outcome}:")
-            print(f"    Best Bid: ${best_bid:.4f}")
-            print(f"    Best Ask: ${best_ask:.4f}")
-            
-            # Visual indicator
-            if spread_pct < 8:
-                indicator = "✅ GOOD"
-            elif spread_pct < 15:
-                indicator = "⚠️  MEDIUM"
-            else:
-                indicator = "❌ WIDE"
-            
-            print(f"    Spread:   {spread_pct:.1f}% {indicator}")
-            print(f"    Depth:    ${bid_depth + ask_depth:.2f}")
-            
-            if best_bid and best_ask and spread_pct < 50:
-                valid_markets += 1
+            print(f"    ⚠️  No liquidity (empty orderbook)")
+            continue
+        
+        spread_pct = spread * 100
+        
+        print(f"  {outcome}:")
+        print(f"    Best Bid: ${best_bid:.4f}")
+        print(f"    Best Ask: ${best_ask:.4f}")
+        
+        # Visual indicator
+        if spread_pct < 8:
+            indicator = "✅ GOOD"
+        elif spread_pct < 15:
+            indicator = "⚠️  MEDIUM"
+        else:
+            indicator = "❌ WIDE"
+        
+        print(f"    Spread:   {spread_pct:.1f}% {indicator}")
+        print(f"    Depth:    ${bid_depth + ask_depth:.2f}")
+        
+        if best_bid and best_ask and spread_pct < 50:
+            valid_markets += 1
 
 print('\n' + '='*70)
 print(f'\nValid markets found: {valid_markets}')